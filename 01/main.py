@@ -1,3 +1,5 @@
+from aoctools.cache import parse_once
+
 INPUT_FILE = "01/input.txt"
 
 
@@ -12,6 +14,7 @@ def read_input_file_as_calories():
                 calories = 0
 
 
+@parse_once
 def get_snacks() -> list[int]:
     snacks = list(read_input_file_as_calories())
     return sorted(snacks, reverse=True)
@@ -19,7 +22,7 @@ def get_snacks() -> list[int]:
 
 def part_one() -> int:
     """https://adventofcode.com/2022/day/1"""
-    return max(get_snacks())
+    return get_snacks()[0]
 
 
 def part_two() -> int:
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from typing import Iterator
-
+from aoctools.cache import parse_once
 
 INPUT_FILE = "04/input.txt"
 
@@ -28,24 +28,24 @@ class Section:
         return f"{self.start}-{self.end}"
 
 
-def is_section_subset_of_the_other(sections_raw: list[str]) -> bool:
-    section_1, section_2 = [
-        Section(*map(int, section_raw.split("-"))) for section_raw in sections_raw
-    ]
-    return any([section_1 <= section_2, section_1 >= section_2])
+def is_section_subset_of_the_other(sections: list[Section]) -> bool:
+    section_1, section_2 = sections
+    return section_1 <= section_2 or section_1 >= section_2
 
 
-def is_section_overlap_with_the_other(sections_raw: list[str]) -> bool:
-    section_1, section_2 = [
-        Section(*map(int, section_raw.split("-"))) for section_raw in sections_raw
-    ]
+def is_section_overlap_with_the_other(sections: list[Section]) -> bool:
+    section_1, section_2 = sections
     return section_1.start <= section_2.end and section_2.start <= section_1.end
 
 
-def read_input_file_as_sections() -> Iterator[list[str]]:
+@parse_once
+def read_input_file_as_sections() -> Iterator[list[Section]]:
     with open(INPUT_FILE) as f:
         for line in f.read().splitlines():
-            sections = line.split(",")
+            sections = [
+                Section(*map(int, section_raw.split("-")))
+                for section_raw in line.split(",")
+            ]
             yield sections
 
 
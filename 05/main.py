@@ -2,6 +2,7 @@ import re
 from collections import defaultdict as ddict
 from collections import OrderedDict as odict
 from typing import Iterator
+from aoctools.cache import parse_once
 
 
 INPUT_FILE = "05/input.txt"
@@ -29,6 +30,14 @@ def top_crates(
     return "".join([tower[-1] for tower in odict(sorted(towers.items())).values()])
 
 
+def copy_towers(
+    parsed_input: tuple[ddict[int, list[str]], list[dict[str, int]]]
+) -> tuple[ddict[int, list[str]], list[dict[str, int]]]:
+    towers, instructions = parsed_input
+    return ddict(list, {i: tower.copy() for i, tower in towers.items()}), instructions
+
+
+@parse_once(copy_with=copy_towers)
 def read_input_file() -> Iterator[tuple[ddict[int, list[str]], list[dict[str, int]]]]:
     regex_towers = r"(\W([A-Z])\W)|(\s\s\s\s)"
     regex_instructions = r"move\s(?P<move>\d+)\sfrom\s(?P<from>\d+)\sto\s(?P<to>\d+)"
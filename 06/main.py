@@ -1,27 +1,57 @@
-INPUT_FILE = "06/input.txt"
+from typing import Iterable
 
+INPUT_FILE = "06/input.txt"
 
-def find_marker_index(buffer_size: int, start_at: int = 0) -> int:
-    buffer = []
-    with open(INPUT_FILE) as f:
-        f.seek(start_at)
-        while char := f.read(1):
-            buffer.append(char)
-            if len(buffer) > buffer_size:
-                buffer.pop(0)
-            if len(set(buffer)) == buffer_size:
-                return f.tell()
-    return -1
+# Window sizes of the start-of-packet and start-of-message markers
+MARKER_SIZES = (4, 14)
+
+
+def find_marker_indices(
+    buffer_sizes: Iterable[int], chunk_size: int = 1 << 20
+) -> dict[int, int]:
+    """Find the markers of several sizes in one pass over the datastream.
+
+    The stream is read in chunks of bytes. The last position of each byte value
+    gives the start of the longest run without repeated bytes that ends at the
+    current position: a marker of size n ends where that run first reaches n
+    bytes, so each byte costs O(1) whatever the sizes.
+
+    :param buffer_sizes: Sizes of the markers to find.
+    :param chunk_size: Number of bytes read at once.
+    :return: Number of bytes read up to the end of each marker, or -1 when the
+        stream has no marker of that size.
+    """
+    indices = {buffer_size: -1 for buffer_size in buffer_sizes}
+    pending = sorted(indices, reverse=True)
+    last_seen = [-1] * 256
+    run_start = 0
+    position = 0
+    with open(INPUT_FILE, "rb") as f:
+        while pending and (chunk := f.read(chunk_size)):
+            for byte in chunk:
+                if last_seen[byte] >= run_start:
+                    run_start = last_seen[byte] + 1
+                last_seen[byte] = position
+                position += 1
+                while pending and position - run_start >= pending[-1]:
+                    indices[pending.pop()] = position
+                if not pending:
+                    break
+    return indices
+
+
+def find_marker_index(buffer_size: int) -> int:
+    return find_marker_indices([buffer_size])[buffer_size]
 
 
 def part_one() -> int:
     """https://adventofcode.com/2022/day/6"""
-    return find_marker_index(4)
+    return find_marker_indices(MARKER_SIZES)[4]
 
 
 def part_two() -> int:
     """https://adventofcode.com/2022/day/6#part2"""
-    return find_marker_index(14, start_at=part_one())
+    return find_marker_indices(MARKER_SIZES)[14]
 
 
 if __name__ == "__main__":
@@ -1,10 +1,15 @@
+import sys
+from bisect import bisect_left, bisect_right
+from heapq import heappop, heappush
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Union
-from operator import lt as less_than, gt as greater_than
-
+from itertools import accumulate
+from typing import Any, Iterable, Iterator, Union
+from aoctools.cache import parse_once
 
 INPUT_FILE = "07/input.txt"
+MAXIMUM_DIR_SIZE = 100000
+NEEDED_SPACE = 30000000
 
 
 class ShellWords(Enum):
@@ -36,6 +41,16 @@ class Directory:
     name: str
     parent: "Directory" = None
     children: list[Union["Directory", File]] = field(default_factory=lambda: [])
+    # Total size of the files below, computed by get_size and cached until a
+    # file is made below
+    size: int = field(default=0, compare=False)
+    is_size_stale: bool = field(default=False, repr=False, compare=False)
+    # Total size of the files directly in this directory
+    files_size: int = field(default=0, repr=False, compare=False)
+    subdirectories: dict[str, "Directory"] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+    files: dict[str, File] = field(default_factory=dict, repr=False, compare=False)
 
     @classmethod
     def root(cls):
@@ -44,41 +59,79 @@ class Directory:
         return root_instance
 
     def get_size(self) -> int:
-        return sum(child.get_size() for child in self.children)
+        """Return the cached size, after recomputing the stale part of the subtree.
+
+        Sizes are aggregated in one iterative post-order pass that skips the
+        subdirectories whose size is still valid, so building a tree then
+        querying its sizes is linear, however deep the tree is.
+        """
+        if not self.is_size_stale:
+            return self.size
+        stack = [(self, False)]
+        while stack:
+            directory, children_done = stack.pop()
+            if children_done:
+                directory.size = directory.files_size + sum(
+                    subdirectory.size
+                    for subdirectory in directory.subdirectories.values()
+                )
+                directory.is_size_stale = False
+                continue
+            stack.append((directory, True))
+            stack.extend(
+                (subdirectory, False)
+                for subdirectory in directory.subdirectories.values()
+                if subdirectory.is_size_stale
+            )
+        return self.size
+
+    def invalidate_size(self) -> None:
+        """Mark this directory and its parents as stale.
+
+        A stale directory only has stale parents, so this stops at the first
+        one that is already stale and costs O(1) amortized while a tree is built.
+        """
+        directory = self
+        while directory is not None and not directory.is_size_stale:
+            directory.is_size_stale = True
+            directory = directory.parent
 
     def get_child(self, name) -> Union["Directory", File]:
-        for child in self.children:
-            if child.name == name:
-                return child
+        if name in self.subdirectories:
+            return self.subdirectories[name]
+        if name in self.files:
+            return self.files[name]
         raise ValueError(f"Child {name} not found")
 
     def check_if_child_already_exists(self, name: str, inst: type) -> None:
-        for child in self.children:
-            if isinstance(child, inst) and child.name == name:
-                raise ValueError(f"{inst.__name__} {name} already exists")
+        children = self.subdirectories if inst is Directory else self.files
+        if name in children:
+            raise ValueError(f"{inst.__name__} {name} already exists")
 
     def make_subdirectory(self, name: str) -> "Directory":
         self.check_if_child_already_exists(name, Directory)
         new_directory = Directory(name, self)
         self.children.append(new_directory)
+        self.subdirectories[name] = new_directory
         return new_directory
 
     def make_file(self, name: str, size: int) -> File:
         self.check_if_child_already_exists(name, File)
         new_file = File(name, size)
         self.children.append(new_file)
+        self.files[name] = new_file
+        self.files_size += size
+        self.invalidate_size()
         return new_file
 
     def get_directories(self) -> list["Directory"]:
+        """Return this directory and all the ones below it, in depth-first order."""
         directories: list[Directory] = []
-
-        def recursive_search(node: Directory, directories: list[Directory]):
-            if isinstance(node, Directory):
-                directories.append(node)
-                for child in node.children:
-                    recursive_search(child, directories)
-
-        recursive_search(self, directories)
+        stack = [self]
+        while stack:
+            directory = stack.pop()
+            directories.append(directory)
+            stack.extend(reversed(directory.subdirectories.values()))
         return directories
 
     def tree(self) -> None:
@@ -106,6 +159,9 @@ class Filesystem:
     available_space: int = 70000000
     root: Directory = None
     current_directory: Directory = None
+    # Sorted sizes of all the directories and their prefix sums, built on demand
+    sorted_sizes: list[int] = field(default=None, repr=False, compare=False)
+    prefix_sums: list[int] = field(default=None, repr=False, compare=False)
 
     def change_directory(self, path: str) -> "Filesystem":
         if path == ShellWords.ROOT.value:
@@ -124,10 +180,12 @@ class Filesystem:
 
     def make_directory(self, name: str) -> "Filesystem":
         self.current_directory.make_subdirectory(name)
+        self.sorted_sizes = self.prefix_sums = None
         return self
 
     def make_file(self, name: str, size: int) -> "Filesystem":
         self.current_directory.make_file(name, size)
+        self.sorted_sizes = self.prefix_sums = None
         return self
 
     def get_directories(self) -> list[Directory]:
@@ -146,7 +204,42 @@ class Filesystem:
             if operator(directory.get_size(), size)
         ]
 
-
+    def get_sorted_sizes(self) -> list[int]:
+        """Return the sizes of all the directories, sorted.
+
+        The sizes and their prefix sums are computed once and reused by the
+        queries below until a directory or a file is made.
+        """
+        if self.sorted_sizes is None:
+            self.sorted_sizes = sorted(
+                directory.get_size() for directory in self.root.get_directories()
+            )
+            self.prefix_sums = list(accumulate(self.sorted_sizes, initial=0))
+        return self.sorted_sizes
+
+    def get_total_size_below(self, size: int) -> int:
+        """Sum the sizes of the directories smaller than `size`."""
+        index = bisect_left(self.get_sorted_sizes(), size)
+        return self.prefix_sums[index]
+
+    def get_smallest_size_above(self, size: int) -> int:
+        """Return the smallest size of a directory larger than `size`.
+
+        :raises ValueError: If no directory is larger than `size`.
+        """
+        sizes = self.get_sorted_sizes()
+        index = bisect_right(sizes, size)
+        if index == len(sizes):
+            raise ValueError(f"No directory is larger than {size}")
+        return sizes[index]
+
+    def count_sizes_between(self, lo: int, hi: int) -> int:
+        """Count the directories whose size is in `[lo, hi]`."""
+        sizes = self.get_sorted_sizes()
+        return max(bisect_right(sizes, hi) - bisect_left(sizes, lo), 0)
+
+
+@parse_once
 def read_input_file_as_filesystem() -> Filesystem:
     fs = Filesystem()
     with open(INPUT_FILE) as f:
@@ -163,22 +256,88 @@ def read_input_file_as_filesystem() -> Filesystem:
     return fs.to_root()
 
 
+def get_directory_sizes_streaming(lines: Iterable[str]) -> Iterator[int]:
+    """Yield the size of each directory as soon as the log leaves it, the root's last.
+
+    Only the running totals of the directories between the root and the current
+    one are kept, so the memory used to produce the sizes is bounded by the
+    depth of the tree and the log can be read from a pipe. Like the puzzle's
+    logs, each directory is assumed to be listed once.
+    """
+    totals: list[int] = []
+
+    def leave() -> int:
+        size = totals.pop()
+        if totals:
+            totals[-1] += size
+        return size
+
+    for line in lines:
+        exp = line.split()
+        if not exp:
+            continue
+        if exp[0] == ShellWords.BANG.value:
+            if exp[1] == ShellWords.CHANGE_DIRECTORY.value:
+                if exp[2] == ShellWords.PARENT.value:
+                    yield leave()
+                elif exp[2] == ShellWords.ROOT.value:
+                    while len(totals) > 1:
+                        yield leave()
+                    if not totals:
+                        totals.append(0)
+                else:
+                    totals.append(0)
+        elif exp[0] != ShellWords.DIRECTORY.value:
+            totals[-1] += int(exp[0])
+    while totals:
+        yield leave()
+
+
+def solve_streaming(lines: Iterable[str]) -> tuple[int, int]:
+    """Answer both parts in one pass over the log, see `get_directory_sizes_streaming`.
+
+    Part one only keeps a running sum. Part two needs the root's size, which is
+    only known at the end of the log, so its candidates are kept in a min-heap:
+    the root is at least as large as the largest size seen so far, so candidates
+    that are already too small to free enough space are popped. Part two's
+    memory is thus bounded by the number of remaining candidates, which is every
+    directory as long as none is larger than the space to free, not by the depth
+    of the tree.
+    """
+    total_below_maximum = 0
+    largest = 0
+    candidates: list[int] = []
+    for size in get_directory_sizes_streaming(lines):
+        if size < MAXIMUM_DIR_SIZE:
+            total_below_maximum += size
+        largest = max(largest, size)
+        minimum_dir_size = NEEDED_SPACE - (Filesystem.available_space - largest)
+        if size > minimum_dir_size:
+            heappush(candidates, size)
+        while candidates and candidates[0] <= minimum_dir_size:
+            heappop(candidates)
+    return total_below_maximum, candidates[0]
+
+
 def part_one() -> int:
     """https://adventofcode.com/2022/day/7"""
     fs = read_input_file_as_filesystem()
     # fs.tree()
-    maximum_dir_size = 100000
-    return sum(fs.get_directory_sizes_when_size_is_(less_than, maximum_dir_size))
+    return fs.get_total_size_below(MAXIMUM_DIR_SIZE)
 
 
 def part_two() -> int:
     """https://adventofcode.com/2022/day/7#part2"""
     fs = read_input_file_as_filesystem()
     # fs.tree()
-    minimum_dir_size = 30000000 - fs.get_remaining_space()
-    return min(fs.get_directory_sizes_when_size_is_(greater_than, minimum_dir_size))
+    minimum_dir_size = NEEDED_SPACE - fs.get_remaining_space()
+    return fs.get_smallest_size_above(minimum_dir_size)
 
 
 if __name__ == "__main__":
-    print(part_one())
-    print(part_two())
+    if sys.argv[1:] == ["-"]:
+        # e.g. `cat huge_log.txt | python 07/main.py -`
+        print(*solve_streaming(sys.stdin), sep="\n")
+    else:
+        print(part_one())
+        print(part_two())
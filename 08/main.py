@@ -1,8 +1,18 @@
 from dataclasses import dataclass
-from aoctools.grid import Coordinates
+from typing import Sequence
+from aoctools.grid import Coordinates, DenseGrid
 from aoctools.math import mul
+from aoctools.cache import parse_once
+
+try:
+    import numpy as np
+except ImportError:  # only the vectorized engine needs numpy
+    np = None
 
 INPUT_FILE = "08/input.txt"
+DIGITS = bytes.maketrans(b"0123456789", bytes(range(10)))
+# "numpy" counts visible trees on a 2-D array, "objects" walks the Tree objects
+ENGINE = "objects" if np is None else "numpy"
 
 
 @dataclass
@@ -114,15 +124,79 @@ class Forest:
             score_multipliers.append(score)
         return mul(score_multipliers)
 
+    def get_heights(self) -> DenseGrid:
+        return DenseGrid(
+            len(self.trees[0]),
+            len(self.trees),
+            bytearray(tree.height for row in self.trees for tree in row),
+        )
+
+    def get_scenic_scores(self) -> list[list[int]]:
+        return get_scenic_scores(self.get_heights())
+
     def get_highest_scenic_score(self) -> int:
-        scores: list[int] = []
-        for row in self.trees:
-            for tree in row:
-                if tree.visible and not self.is_tree_at_the_edge(tree):
-                    scores.append(self.get_scenic_score(tree))
-        return max(scores)
+        return max(max(row) for row in self.get_scenic_scores())
+
+
+def get_viewing_distances(heights: Sequence[int]) -> list[int]:
+    """For each tree of a line, count the trees it sees towards the start of the line.
+
+    A monotonic stack keeps the trees that are still unblocked, so the whole
+    line is processed in O(n).
+    """
+    distances: list[int] = []
+    stack: list[int] = []
+    for i, height in enumerate(heights):
+        while stack and heights[stack[-1]] < height:
+            stack.pop()
+        distances.append(i - stack[-1] if stack else i)
+        stack.append(i)
+    return distances
+
+
+def get_scenic_scores(heights: DenseGrid) -> list[list[int]]:
+    """Return the scenic score of every tree, in O(width * height)."""
+    width, height = heights.width, heights.height
+    scores = [1] * len(heights)
+    for y, row in enumerate(heights.rows()):
+        towards_left = get_viewing_distances(row)
+        towards_right = get_viewing_distances(row[::-1])[::-1]
+        for x in range(width):
+            scores[y * width + x] *= towards_left[x] * towards_right[x]
+    for x, column in enumerate(heights.columns()):
+        towards_top = get_viewing_distances(column)
+        towards_bottom = get_viewing_distances(column[::-1])[::-1]
+        for y in range(height):
+            scores[y * width + x] *= towards_top[y] * towards_bottom[y]
+    return [scores[y * width : (y + 1) * width] for y in range(height)]
+
+
+def get_visibility_from_left(heights: "np.ndarray") -> "np.ndarray":
+    highest_on_the_left = np.full(heights.shape, -1, dtype=np.int16)
+    highest_on_the_left[:, 1:] = np.maximum.accumulate(heights, axis=1)[:, :-1]
+    return heights > highest_on_the_left
+
+
+def count_visible_trees_vectorized(heights: DenseGrid) -> int:
+    if np is None:
+        raise ModuleNotFoundError("The vectorized engine requires numpy")
+    trees = np.frombuffer(heights.cells, dtype=np.uint8).reshape(
+        heights.height, heights.width
+    )
+    visible = get_visibility_from_left(trees)
+    visible |= np.fliplr(get_visibility_from_left(np.fliplr(trees)))
+    visible |= get_visibility_from_left(trees.T).T
+    visible |= np.flipud(get_visibility_from_left(np.flipud(trees).T).T)
+    return int(visible.sum())
+
+
+@parse_once
+def read_input_file_as_heights() -> DenseGrid:
+    with open(INPUT_FILE) as f:
+        return DenseGrid.from_lines(f.read().splitlines(), DIGITS)
 
 
+@parse_once
 def read_input_file_as_forest() -> Forest:
     trees: list[list[Tree]] = []
     with open(INPUT_FILE) as f:
@@ -135,14 +209,15 @@ def read_input_file_as_forest() -> Forest:
 
 def part_one() -> int:
     """https://adventofcode.com/2022/day/8"""
+    if ENGINE == "numpy":
+        return count_visible_trees_vectorized(read_input_file_as_heights())
     forest = read_input_file_as_forest()
     return forest.count_visible_trees()
 
 
 def part_two() -> int:
     """https://adventofcode.com/2022/day/8#part2"""
-    forest = read_input_file_as_forest()
-    return forest.get_highest_scenic_score()
+    return max(max(row) for row in get_scenic_scores(read_input_file_as_heights()))
 
 
 if __name__ == "__main__":
@@ -1,132 +1,286 @@
-from dataclasses import dataclass, field
-from typing import Iterator
+import sys
+from array import array
+from typing import BinaryIO, Iterable, Iterator
 from aoctools.grid import Coordinates
+from aoctools.cache import parse_once
 
 INPUT_FILE = "09/input.txt"
 
 
-@dataclass
-class Knot:
-    coordinates: Coordinates = field(default_factory=lambda: Coordinates(0, 0))
-    id: int = 0
-    head: "Knot" = None
-    tail: "Knot" = None
-    coordinates_history: set = field(default_factory=lambda: set())
+# Move of the head for each direction, the y axis pointing down
+DIRECTIONS = {"U": (0, -1), "D": (0, 1), "R": (1, 0), "L": (-1, 0)}
 
-    def __post_init__(self):
-        self.coordinates_history.add(self.coordinates)
 
-    def __str__(self) -> str:
-        return f"{{{self.id}: {self.coordinates}}}"
-
-    def __repr__(self) -> str:
-        return self.__str__()
-
-    def make_rope(self, knots_number: int) -> "Knot":
-        knot = self
-        for id in range(knots_number):
-            knot.tail = Knot(head=knot, id=id + 1)
-            knot = knot.tail
-        return self
-
-    def get_tail(self) -> "Knot":
-        if self.tail is None:
-            return self
-        return self.tail.get_tail()
-
-    def as_string(self) -> str:
-        def recursive_string(string: str, knot: "Knot") -> str:
-            if knot.tail is not None:
-                return recursive_string(f"{string} -> {knot.tail}", knot.tail)
-            else:
-                return string
+TILE_SIZE = 64
+ROW_MASK = (1 << TILE_SIZE) - 1
+# COLUMNS[n] has the first bit of the n first rows of a tile set
+COLUMNS = [
+    sum(1 << (TILE_SIZE * row) for row in range(n)) for n in range(TILE_SIZE + 1)
+]
+
+
+class VisitedCells:
+    """Set of cells stored as a chunked bitmap.
+
+    The plane is cut into 64x64 tiles, created when a cell of theirs is first
+    visited. Each tile is an int whose bit `64 * row + column` tells whether a
+    cell is visited, so a straight line of cells is added with one bitwise or
+    per tile.
+    """
+
+    def __init__(self, cells: Iterable[tuple[int, int]] = ()) -> None:
+        self.tiles: dict[tuple[int, int], int] = {}
+        self.count = 0
+        for x, y in cells:
+            self.add(x, y)
+
+    def _set(self, tile: tuple[int, int], mask: int) -> None:
+        bits = self.tiles.get(tile, 0)
+        if bits | mask != bits:
+            self.count += (bits | mask).bit_count() - bits.bit_count()
+            self.tiles[tile] = bits | mask
+
+    def add(self, x: int, y: int) -> None:
+        tile = x // TILE_SIZE, y // TILE_SIZE
+        bit = 1 << (TILE_SIZE * (y % TILE_SIZE) + x % TILE_SIZE)
+        bits = self.tiles.get(tile, 0)
+        if not bits & bit:
+            self.tiles[tile] = bits | bit
+            self.count += 1
+
+    def add_horizontal(self, x_start: int, x_end: int, y: int) -> None:
+        """Add the cells of row `y` from `x_start` included to `x_end` excluded."""
+        tile_y, row = divmod(y, TILE_SIZE)
+        for tile_x in range(x_start // TILE_SIZE, (x_end - 1) // TILE_SIZE + 1):
+            start = max(x_start - tile_x * TILE_SIZE, 0)
+            end = min(x_end - tile_x * TILE_SIZE, TILE_SIZE)
+            mask = ((1 << (end - start)) - 1) << (TILE_SIZE * row + start)
+            self._set((tile_x, tile_y), mask)
 
-        return recursive_string(str(self), self)
+    def add_vertical(self, x: int, y_start: int, y_end: int) -> None:
+        """Add the cells of column `x` from `y_start` included to `y_end` excluded."""
+        tile_x, column = divmod(x, TILE_SIZE)
+        for tile_y in range(y_start // TILE_SIZE, (y_end - 1) // TILE_SIZE + 1):
+            start = max(y_start - tile_y * TILE_SIZE, 0)
+            end = min(y_end - tile_y * TILE_SIZE, TILE_SIZE)
+            mask = COLUMNS[end - start] << (TILE_SIZE * start + column)
+            self._set((tile_x, tile_y), mask)
 
-    def get_distance_to(self, other: "Knot") -> int:
-        return int(
-            (
-                (self.coordinates.x - other.coordinates.x) ** 2
-                + (self.coordinates.y - other.coordinates.y) ** 2
+    def __contains__(self, cell: tuple[int, int]) -> bool:
+        x, y = cell
+        bits = self.tiles.get((x // TILE_SIZE, y // TILE_SIZE), 0)
+        return bool(bits >> (TILE_SIZE * (y % TILE_SIZE) + x % TILE_SIZE) & 1)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        for (tile_x, tile_y), bits in self.tiles.items():
+            while bits:
+                index = (bits & -bits).bit_length() - 1
+                bits &= bits - 1
+                row, column = divmod(index, TILE_SIZE)
+                yield tile_x * TILE_SIZE + column, tile_y * TILE_SIZE + row
+
+    def get_row(self, y: int, x_start: int, x_end: int) -> bytes:
+        """Return the cells of row `y` in `[x_start, x_end)` as a bitmap.
+
+        :return: Little-endian bytes, bit `x - x_start` being set when visited.
+        """
+        tile_y, row = divmod(y, TILE_SIZE)
+        first_tile = x_start // TILE_SIZE
+        bits = 0
+        for tile_x in range((x_end - 1) // TILE_SIZE, first_tile - 1, -1):
+            tile = self.tiles.get((tile_x, tile_y), 0)
+            bits = bits << TILE_SIZE | (tile >> (TILE_SIZE * row)) & ROW_MASK
+        bits >>= x_start - first_tile * TILE_SIZE
+        bits &= (1 << (x_end - x_start)) - 1
+        return bits.to_bytes((x_end - x_start + 7) // 8, "little")
+
+    def get_bounds(self) -> tuple[int, int, int, int]:
+        """Return the `(min_x, min_y, max_x, max_y)` of the visited cells."""
+        if not self.count:
+            raise ValueError("No visited cell")
+        tiles = [(tile, bits) for tile, bits in self.tiles.items() if bits]
+        min_x = min_y = sys.maxsize
+        max_x = max_y = -sys.maxsize
+        for (tile_x, tile_y), bits in tiles:
+            columns = bits
+            for shift in (2048, 1024, 512, 256, 128, 64):
+                columns |= columns >> shift
+            columns &= ROW_MASK
+            min_x = min(
+                min_x, tile_x * TILE_SIZE + (columns & -columns).bit_length() - 1
             )
-            ** (1 / 2)
-        )
+            max_x = max(max_x, tile_x * TILE_SIZE + columns.bit_length() - 1)
+            min_y = min(
+                min_y,
+                tile_y * TILE_SIZE + ((bits & -bits).bit_length() - 1) // TILE_SIZE,
+            )
+            max_y = max(
+                max_y, tile_y * TILE_SIZE + (bits.bit_length() - 1) // TILE_SIZE
+            )
+        return min_x, min_y, max_x, max_y
 
-    def move(self, direction: str) -> None:
-        if direction == "U":
-            self.coordinates = Coordinates.at_the_top_of(self.coordinates)
-        elif direction == "D":
-            self.coordinates = Coordinates.at_the_bottom_of(self.coordinates)
-        elif direction == "R":
-            self.coordinates = Coordinates.to_the_right_of(self.coordinates)
-        elif direction == "L":
-            self.coordinates = Coordinates.to_the_left_of(self.coordinates)
-        self.coordinates_history.add(self.coordinates)
-        self.tail.follow_head()
-
-    def follow_head(self) -> None:
-        if self.get_distance_to(self.head) > 1:
-            head_coords = self.head.coordinates
-            self_coords = self.coordinates
-            if head_coords.is_verticaly_aligned(self_coords):
-                if head_coords.is_at_the_bottom_of(self_coords):
-                    self.coordinates = Coordinates.at_the_bottom_of(self_coords)
-                elif head_coords.is_at_the_top_of(self_coords):
-                    self.coordinates = Coordinates.at_the_top_of(self_coords)
-            elif head_coords.is_horizontaly_aligned(self_coords):
-                if head_coords.is_on_the_right_of(self_coords):
-                    self.coordinates = Coordinates.to_the_right_of(self_coords)
-                elif head_coords.is_on_the_left_of(self_coords):
-                    self.coordinates = Coordinates.to_the_left_of(self_coords)
-            else:
-                # Head and tail are not aligned
-                if head_coords.is_at_the_top_left_of(self_coords):
-                    self.coordinates = Coordinates.at_the_top_left_of(self_coords)
-                elif head_coords.is_at_the_bottom_left_of(self_coords):
-                    self.coordinates = Coordinates.at_the_bottom_left_of(self_coords)
-                elif head_coords.is_at_the_top_right_of(self_coords):
-                    self.coordinates = Coordinates.at_the_top_right_of(self_coords)
-                elif head_coords.is_at_the_bottom_right_of(self_coords):
-                    self.coordinates = Coordinates.at_the_bottom_right_of(self_coords)
-        self.coordinates_history.add(self.coordinates)
-        if self.tail is not None:
-            self.tail.follow_head()
-
-
-def print_grid(coordinates_history: set[Coordinates]) -> None:
-    all_x_coordinates = [coordinates.x for coordinates in coordinates_history]
-    all_y_coordinates = [coordinates.y for coordinates in coordinates_history]
-    min_x, max_x = min(all_x_coordinates), max(all_x_coordinates)
-    min_y, max_y = min(all_y_coordinates), max(all_y_coordinates)
+
+# Characters of the 8 cells of each byte of a row bitmap, by output format
+PIXELS = {
+    image_format: [
+        b"".join(visited if byte >> bit & 1 else empty for bit in range(8))
+        for byte in range(256)
+    ]
+    for image_format, (visited, empty) in {
+        "text": (b"#", b"."),
+        "pbm": (b"1", b"0"),
+        "pgm": (b"\x00", b"\xff"),
+    }.items()
+}
+
+
+def render_visited_cells(
+    visited: VisitedCells, out: BinaryIO = None, image_format: str = "text"
+) -> None:
+    """Draw the bounding box of the visited cells, written in one call.
+
+    :param visited: Cells to draw.
+    :param out: Binary file to write to, the standard output by default.
+    :param image_format: "text" draws `#` and `.`, "pbm" a plain PBM image and
+        "pgm" a binary PGM image, visited cells being black.
+    """
+    min_x, min_y, max_x, max_y = visited.get_bounds()
+    width, height = max_x - min_x + 1, max_y - min_y + 1
+    pixels = PIXELS[image_format]
+    frame = []
+    if image_format == "pbm":
+        frame.append(f"P1\n{width} {height}\n".encode())
+    elif image_format == "pgm":
+        frame.append(f"P5\n{width} {height}\n255\n".encode())
     for y in range(min_y, max_y + 1):
-        for x in range(min_x, max_x + 1):
-            if Coordinates(x, y) in coordinates_history:
-                print("#", end="")
+        row = b"".join(pixels[byte] for byte in visited.get_row(y, min_x, max_x + 1))
+        frame.append(row[:width])
+        if image_format != "pgm":
+            frame.append(b"\n")
+    if out is None:
+        sys.stdout.flush()
+        out = sys.stdout.buffer
+    out.write(b"".join(frame))
+    out.flush()
+
+
+class Rope:
+    """Knots of a rope, the head being knot 0, stored in two flat int arrays.
+
+    Knots are updated iteratively, so a rope can be as long as needed, and the
+    cells visited by a knot are only recorded when it is tracked.
+    """
+
+    def __init__(self, knots_number: int, tracked: Iterable[int] = ()) -> None:
+        self.xs = array("q", [0]) * knots_number
+        self.ys = array("q", [0]) * knots_number
+        self.history: list[VisitedCells | None] = [None] * knots_number
+        for knot in tracked:
+            self.history[knot] = VisitedCells([(0, 0)])
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def __str__(self) -> str:
+        return " -> ".join(
+            f"{{{knot}: {Coordinates(x, y)}}}"
+            for knot, (x, y) in enumerate(zip(self.xs, self.ys))
+        )
+
+    def get_visited_cells(self, knot: int = -1) -> VisitedCells:
+        """Return the cells visited by a tracked knot, by default the tail."""
+        visited = self.history[knot]
+        if visited is None:
+            raise ValueError(f"Knot {knot} is not tracked")
+        return visited
+
+    def step(self, dx: int, dy: int) -> bool:
+        """Move the head by one step and let the other knots follow it.
+
+        A knot that is not touching the knot before it moves by one step
+        towards it along each axis (the sign of the difference). Once a knot
+        stays in place, the ones after it do too.
+
+        :return: Whether every knot moved by the same step as the head, i.e.
+            the rope is straight behind the head and will stay so.
+        """
+        xs, ys, history = self.xs, self.ys, self.history
+        x, y = xs[0] + dx, ys[0] + dy
+        xs[0], ys[0] = x, y
+        if history[0] is not None:
+            history[0].add(x, y)
+        is_straight = True
+        for knot in range(1, len(xs)):
+            delta_x, delta_y = x - xs[knot], y - ys[knot]
+            if -1 <= delta_x <= 1 and -1 <= delta_y <= 1:
+                return False
+            step_x = (delta_x > 0) - (delta_x < 0)
+            step_y = (delta_y > 0) - (delta_y < 0)
+            if step_x != dx or step_y != dy:
+                is_straight = False
+            x, y = xs[knot] + step_x, ys[knot] + step_y
+            xs[knot], ys[knot] = x, y
+            if history[knot] is not None:
+                history[knot].add(x, y)
+        return is_straight
+
+    def move(self, direction: str, steps: int = 1) -> None:
+        """Move the head by `steps` steps in a direction.
+
+        Steps are simulated one by one until the rope is straight behind the
+        head. From then on, every knot follows the head in lockstep, so the
+        rest of the move is a translation of the whole rope and each tracked
+        knot visits a straight line of cells.
+        """
+        dx, dy = DIRECTIONS[direction]
+        done = 0
+        for done in range(1, steps + 1):
+            if self.step(dx, dy):
+                break
+        left = steps - done
+        if left <= 0:
+            return
+        for knot, visited in enumerate(self.history):
+            if visited is None:
+                continue
+            x, y = self.xs[knot], self.ys[knot]
+            if dx > 0:
+                visited.add_horizontal(x + 1, x + left + 1, y)
+            elif dx < 0:
+                visited.add_horizontal(x - left, x, y)
+            elif dy > 0:
+                visited.add_vertical(x, y + 1, y + left + 1)
             else:
-                print(".", end="")
-        print()
+                visited.add_vertical(x, y - left, y)
+        if dx:
+            self.xs = array("q", (x + dx * left for x in self.xs))
+        else:
+            self.ys = array("q", (y + dy * left for y in self.ys))
 
 
-def read_input_file_as_direction() -> Iterator[str]:
+@parse_once
+def read_input_file_as_moves() -> Iterator[tuple[str, int]]:
     with open(INPUT_FILE) as f:
         for line in f.read().splitlines():
             direction, steps = line.split()
-            for _ in range(int(steps)):
-                yield direction
+            yield direction, int(steps)
 
 
 def get_number_of_position(
     number_of_rope_knots: int, print_tail_trace: bool = False, debug_mode=False
 ) -> int:
-    rope = Knot().make_rope(number_of_rope_knots)
-    for direction in read_input_file_as_direction():
-        rope.move(direction)
+    rope = Rope(number_of_rope_knots + 1, tracked=[number_of_rope_knots])
+    for direction, steps in read_input_file_as_moves():
+        rope.move(direction, steps)
         if debug_mode:
-            print(rope.as_string())
-    tail: Knot = rope.get_tail()
+            print(rope)
+    visited_cells = rope.get_visited_cells()
     if print_tail_trace:
-        print_grid(tail.coordinates_history)
-    return len(tail.coordinates_history)
+        render_visited_cells(visited_cells)
+    return len(visited_cells)
 
 
 def part_one() -> int:
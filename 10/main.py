@@ -1,5 +1,6 @@
 from enum import Enum
 from typing import Iterator
+from aoctools.cache import parse_once
 
 
 INPUT_FILE = "10/input.txt"
@@ -15,6 +16,7 @@ class Pixel(Enum):
         return self.value
 
 
+@parse_once
 def read_input_file() -> Iterator[list[str]]:
     with open(INPUT_FILE) as f:
         for line in f.read().splitlines():
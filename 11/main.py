@@ -1,9 +1,15 @@
-from dataclasses import dataclass
-from typing import Iterator
+from dataclasses import dataclass, field
+from typing import Callable, Iterator
 import re
 import operator
 
+try:
+    import numpy as np
+except ImportError:  # only the vectorized engine needs numpy
+    np = None
+
 from aoctools.math import mul
+from aoctools.cache import parse_once
 
 INPUT_FILE = "11/input.txt"
 
@@ -14,6 +20,23 @@ ops = {
     "/": operator.truediv,
 }
 
+# "cycles" follows each item until its trajectory loops, "numpy" plays every
+# round with each monkey's items in an array
+ENGINE = "cycles"
+
+
+def compile_operation(operation: list[str]) -> Callable:
+    """Turn `["*", "19"]` or `["*", "old"]` into a function of the worry level.
+
+    The function only uses arithmetic operators, so it applies as well to an
+    int as to a NumPy array of worry levels.
+    """
+    apply, operand = ops[operation[0]], operation[1]
+    if operand == "old":
+        return lambda worry_level: apply(worry_level, worry_level)
+    operand = int(operand)
+    return lambda worry_level: apply(worry_level, operand)
+
 
 @dataclass
 class Monkey:
@@ -24,6 +47,20 @@ class Monkey:
     id_false: int
     current_items: list[int]
     inspection_score: int = 0
+    operate: Callable = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.operate = compile_operation(self.operation)
+
+    def __getstate__(self) -> dict:
+        # The compiled operation is a closure, rebuild it instead of pickling it
+        state = self.__dict__.copy()
+        del state["operate"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.__post_init__()
 
     def __lt__(self, other: "Monkey") -> bool:
         return self.id < other.id
@@ -41,33 +78,33 @@ class Monkey:
             int(item) for item in monkey["current_items"].split(", ")
         ]
         monkey["operation"] = monkey["operation"].split(" ")
+        monkey["id"] = int(monkey["id"])
         monkey["divisor"] = int(monkey["divisor"])
         monkey["id_true"] = int(monkey["id_true"])
         monkey["id_false"] = int(monkey["id_false"])
         return cls(**monkey)
 
-    def inspect_and_throw(self, with_weak_limiter: bool = True) -> int:
-        worry_level = self.current_items.pop(0)
-
-        if self.operation[1] == "old":
-            multiplier = worry_level
-        else:
-            multiplier = int(self.operation[1])
-        worry_level = ops[self.operation[0]](worry_level, multiplier)
+    def inspect(self, worry_level: int, with_weak_limiter: bool = True) -> int:
+        """Return the monkey an item is thrown to and its new worry level."""
+        worry_level = self.operate(worry_level)
 
         if with_weak_limiter:
-            worry_level = int(worry_level / 3)
+            worry_level //= 3
 
-        self.inspection_score += 1
         return (
             self.id_true if worry_level % self.divisor == 0 else self.id_false,
             worry_level,
         )
 
+    def inspect_and_throw(self, with_weak_limiter: bool = True) -> int:
+        self.inspection_score += 1
+        return self.inspect(self.current_items.pop(0), with_weak_limiter)
+
     def receive(self, worry_level: int) -> None:
         self.current_items.append(worry_level)
 
 
+@parse_once
 def read_input_file_as_monkey() -> Iterator[Monkey]:
     acc = ""
     with open(INPUT_FILE) as f:
@@ -80,17 +117,117 @@ def read_input_file_as_monkey() -> Iterator[Monkey]:
     yield Monkey.generated_from_string(acc)
 
 
+def count_inspections_of_item(
+    monkeys: list[Monkey],
+    monkey_id: int,
+    item: int,
+    max_round: int,
+    with_weak_limiter: bool = True,
+) -> list[int]:
+    """Count how many times each monkey inspects one item over `max_round` rounds.
+
+    Items never interact, so each one is followed on its own. At the start of a
+    round, an item is fully described by its monkey and its worry level modulo
+    the product of the divisors: there are finitely many such states, so the
+    trajectory ends up in a cycle, whose inspections are then repeated by
+    multiplication instead of simulation. The starting worry level is kept as
+    is until its first inspection, as the weak limiter is applied to it before
+    any reduction.
+
+    :return: Number of inspections by monkey id.
+    """
+    n = mul([monkey.divisor for monkey in monkeys])
+    seen: dict[tuple[int, int], int] = {}
+    # Monkeys inspecting the item, round after round, and where each round starts
+    inspected_by: list[int] = []
+    round_starts: list[int] = []
+    cycle = None
+    for round_index in range(max_round):
+        state = monkey_id, item
+        if state in seen:
+            cycle = seen[state], round_index
+            break
+        seen[state] = round_index
+        round_starts.append(len(inspected_by))
+        # Monkeys play in order, so an item thrown forward is inspected again
+        while True:
+            inspected_by.append(monkey_id)
+            targeted_index, item = monkeys[monkey_id].inspect(item, with_weak_limiter)
+            item %= n  # to improve performances
+            thrown_forward = targeted_index > monkey_id
+            monkey_id = targeted_index
+            if not thrown_forward:
+                break
+    round_starts.append(len(inspected_by))
+
+    inspections = [0] * len(monkeys)
+    for inspecting_id in inspected_by:
+        inspections[inspecting_id] += 1
+    if cycle is not None:
+        cycle_start, cycle_end = cycle
+        repeats, rest = divmod(max_round - cycle_end, cycle_end - cycle_start)
+        for inspecting_id in inspected_by[
+            round_starts[cycle_start] : round_starts[cycle_end]
+        ]:
+            inspections[inspecting_id] += repeats
+        for inspecting_id in inspected_by[
+            round_starts[cycle_start] : round_starts[cycle_start + rest]
+        ]:
+            inspections[inspecting_id] += 1
+    return inspections
+
+
+def count_inspections_vectorized(
+    monkeys: list[Monkey], max_round: int, with_weak_limiter: bool = True
+) -> list[int]:
+    """Play the rounds with NumPy, each monkey's turn being a few array operations.
+
+    Worry levels are reduced modulo the product of the divisors after each
+    inspection, so they are int64 unless squaring one of them or a starting
+    worry level could overflow, in which case Python ints are kept.
+
+    :return: Number of inspections by monkey id.
+    """
+    if np is None:
+        raise ModuleNotFoundError("The vectorized engine requires numpy")
+    n = mul([monkey.divisor for monkey in monkeys])
+    largest = max(
+        [n - 1] + [item for monkey in monkeys for item in monkey.current_items]
+    )
+    dtype = np.int64 if largest**2 < 2**63 else object
+    received = [[np.array(monkey.current_items, dtype=dtype)] for monkey in monkeys]
+    inspections = [0] * len(monkeys)
+    for _ in range(max_round):
+        for monkey in monkeys:
+            items = received[monkey.id]
+            if not items:
+                continue
+            worry_levels = items[0] if len(items) == 1 else np.concatenate(items)
+            received[monkey.id] = []
+            inspections[monkey.id] += len(worry_levels)
+            worry_levels = monkey.operate(worry_levels)
+            if with_weak_limiter:
+                worry_levels //= 3
+            is_divisible = worry_levels % monkey.divisor == 0
+            worry_levels %= n  # to improve performances
+            received[monkey.id_true].append(worry_levels[is_divisible])
+            received[monkey.id_false].append(worry_levels[~is_divisible])
+    return inspections
+
+
 def get_monkey_business_level(max_round: int, with_weak_limiter=True) -> int:
     monkeys = sorted(list(read_input_file_as_monkey()))
-    n = mul([monkey.divisor for monkey in monkeys])
-    for _ in range(1, max_round + 1):
+    if ENGINE == "numpy":
+        scores = count_inspections_vectorized(monkeys, max_round, with_weak_limiter)
+    else:
+        scores = [0] * len(monkeys)
         for monkey in monkeys:
-            monkey: Monkey
-            while monkey.current_items:
-                targeted_index, item = monkey.inspect_and_throw(with_weak_limiter)
-                item = item % n  # to improve performances
-                monkeys[targeted_index].receive(item)
-    scores = sorted([monkey.inspection_score for monkey in monkeys], reverse=True)
+            for item in monkey.current_items:
+                inspections = count_inspections_of_item(
+                    monkeys, monkey.id, item, max_round, with_weak_limiter
+                )
+                scores = [score + count for score, count in zip(scores, inspections)]
+    scores.sort(reverse=True)
     return mul(scores[:2])
 
 
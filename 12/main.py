@@ -1,117 +1,71 @@
-from dataclasses import dataclass, field
+from array import array
 from enum import Enum
-from aoctools.grid import Coordinates
+from aoctools.grid import DenseGrid
+from aoctools.cache import parse_once
+from aoctools.search import UNREACHABLE, breadth_first_search
 
 INPUT_FILE = "12/input.txt"
 
+LOWEST_HEIGHT = 1
+
 
 class Marker(Enum):
     START = "S"
     END = "E"
 
 
-@dataclass
-class Cell:
-    height: int
-    coordinates: Coordinates
-    higher_neighbors: list["Cell"] = field(default_factory=lambda: [])
+# a..z are heights 1..26, the start is at height "a" and the end at height 27
+HEIGHTS = bytes.maketrans(
+    f"abcdefghijklmnopqrstuvwxyz{Marker.START.value}{Marker.END.value}".encode(),
+    bytes(range(1, 27)) + bytes([1, 27]),
+)
 
-    def __str__(self) -> str:
-        return str(
-            f"{self.coordinates}: {self.height} -> {[f'{neighbour.coordinates}: {neighbour.height}' for neighbour in self.higher_neighbors]}"
-        )
 
-    def __repr__(self) -> str:
-        return f"{self.coordinates}: {self.height}"
+@parse_once
+def read_input_file_as_heightmap() -> tuple[DenseGrid, int, int]:
+    with open(INPUT_FILE) as f:
+        heightmap = DenseGrid.from_lines(f.read().splitlines())
+    start = heightmap.find(ord(Marker.START.value))
+    end = heightmap.find(ord(Marker.END.value))
+    heightmap.cells = heightmap.cells.translate(HEIGHTS)
+    return heightmap, start, end
 
-    def __hash__(self):
-        return hash((self.height, self.coordinates))
 
+def get_distances_to(heightmap: DenseGrid, end: int) -> array:
+    """Breadth first search run backwards from the end cell.
 
-def read_input_file_as_start_and_end_cells() -> tuple[Cell, Cell]:
-    matrix: list[list[Cell]] = []
-    start_cell: Cell
-    end_cell: Cell
+    A step from a cell to a neighbour is allowed when the neighbour is at most
+    one higher, so going backwards a cell is reached from any neighbour that is
+    at most one lower.
 
-    with open(INPUT_FILE) as f:
-        for i, line in enumerate(f.read().splitlines()):
-            row = []
-            for j, char in enumerate(line):
-                coords = Coordinates(j, i)
-                if char == Marker.START.value:
-                    cell = start_cell = Cell(1, coords)
-                elif char == Marker.END.value:
-                    cell = end_cell = Cell(27, coords)
-                else:
-                    cell = Cell(ord(char) - 96, coords)
-                row.append(cell)
-            matrix.append(row)
-
-    # Find neighbours
-    for row in matrix:
-        for cell in row:
-            cell: Cell
-            for coords in [
-                Coordinates.to_the_left_of(cell.coordinates),
-                Coordinates.at_the_top_of(cell.coordinates),
-                Coordinates.to_the_right_of(cell.coordinates),
-                Coordinates.at_the_bottom_of(cell.coordinates),
-            ]:
-                if 0 <= coords.x < len(matrix[0]) and 0 <= coords.y < len(matrix):
-                    target_cell = matrix[coords.y][coords.x]
-                    if target_cell.height <= cell.height + 1:
-                        cell.higher_neighbors.append(matrix[coords.y][coords.x])
-
-    return start_cell, end_cell
-
-
-def breadth_first_search(
-    start_cell: Cell, end_cell: Cell = None
-) -> tuple[int, set[Cell]]:
-    # If end_cell is None, we want to find the zone with the same height
-    # Else, we want to find the shortest path to the end_cell
-    queue = [[start_cell, 0]]
-    visited = set()
-    while queue:
-        cell, value = queue.pop(0)
-        cell: Cell
-        value: int
-        if cell in visited:
-            continue
-        visited.add(cell)
-        if cell == end_cell:
-            return value, visited
-        for neighbour in cell.higher_neighbors:
-            if [neighbour.height == cell.height, neighbour not in visited][
-                bool(end_cell)
-            ]:
-                queue.append([neighbour, value + 1])
-    return -1, visited
-
-
-def find_shortest_length(start_cell: Cell, end_cell: Cell) -> int:
-    v, _ = breadth_first_search(start_cell, end_cell)
-    return v
-
-
-def get_zone_with_same_height(cell: Cell) -> list[Cell]:
-    _, z = breadth_first_search(cell)
-    return list(z)
+    :return: Shortest number of steps from each cell to `end`, or UNREACHABLE.
+    """
+    heights = heightmap.cells
+    return breadth_first_search(
+        heightmap,
+        end,
+        can_move=lambda cell, neighbour: heights[neighbour] >= heights[cell] - 1,
+    ).distances
 
 
 def part_one() -> int:
     """https://adventofcode.com/2022/day/12"""
-    start_cell, end_cell = read_input_file_as_start_and_end_cells()
-    score = find_shortest_length(start_cell, end_cell)
-    return score
+    heightmap, start, end = read_input_file_as_heightmap()
+    return get_distances_to(heightmap, end)[start]
 
 
 def part_two() -> int:
     """https://adventofcode.com/2022/day/12#part2"""
-    original_cell, end_cell = read_input_file_as_start_and_end_cells()
-    start_cells = get_zone_with_same_height(original_cell)
-    scores = [find_shortest_length(start_cell, end_cell) for start_cell in start_cells]
-    return min(scores)
+    heightmap, _, end = read_input_file_as_heightmap()
+    distances = get_distances_to(heightmap, end)
+    return min(
+        (
+            distance
+            for height, distance in zip(heightmap.cells, distances)
+            if height == LOWEST_HEIGHT and distance != UNREACHABLE
+        ),
+        default=UNREACHABLE,
+    )
 
 
 if __name__ == "__main__":
@@ -5,6 +5,7 @@ from collections import UserList
 from typing import Iterator, Union
 
 from aoctools.math import mul
+from aoctools.cache import parse_once
 
 
 class Packet(UserList):
@@ -47,6 +48,7 @@ class Packet(UserList):
         return self.compare(other, self.data)
 
 
+@parse_once
 def read_input_file_as_packet() -> Iterator[list]:
     with open(INPUT_FILE) as f:
         for line in f.read().splitlines():
@@ -1,9 +1,10 @@
 INPUT_FILE = "14/input.txt"
 
-from dataclasses import dataclass
 from enum import Enum
+from itertools import pairwise
 from typing import Iterator
-from aoctools.grid import Coordinates
+from aoctools.grid import Coordinates, SparseGrid
+from aoctools.cache import parse_once
 
 SAND_SOURCE = Coordinates(500, 0)
 
@@ -16,137 +17,59 @@ class Pixel(Enum):
     AIR = "."
 
 
-@dataclass
-class Cell:
-    coordinates: Coordinates
-    value: Pixel = Pixel.AIR
-
-    def __str__(self) -> str:
-        return self.value.value
-
-    def __repr__(self) -> str:
-        return str(self)
-
-    def is_traversable(self) -> bool:
-        return self.value in (Pixel.AIR, Pixel.FLOWING_SAND)
+# Byte stored in the grid for each pixel
+SAND_SOURCE_VALUE = ord(Pixel.SAND_SOURCE.value)
+SAND_VALUE = ord(Pixel.SAND.value)
+ROCK_VALUE = ord(Pixel.ROCK.value)
+FLOWING_SAND_VALUE = ord(Pixel.FLOWING_SAND.value)
+AIR_VALUE = ord(Pixel.AIR.value)
 
 
 # @dataclass
 class Grid:
-    cells = list[list[Cell]]
+    cells: SparseGrid
     without_floor: bool = True
 
     def __init__(self, without_floor=True) -> None:
         self.without_floor = without_floor
 
     def __str__(self) -> str:
-        return "\n".join("".join(str(cell) for cell in row) for row in self.cells)
+        return str(self.cells)
 
     def __repr__(self) -> str:
         return str(self)
 
-    def get_cell(self, coordinates: Coordinates) -> Cell:
-        return self.cells[coordinates.y - self.start_min_y][
-            coordinates.x - self.start_min_x
-        ]
-
-    def find_cells_between(
-        self, start_coord: Coordinates, end_coord: Coordinates
-    ) -> None:
-        current_coord = start_coord
-        resp = []
-        while current_coord != end_coord:
-            if end_coord.is_verticaly_aligned(current_coord):
-                if end_coord.is_at_the_top_of(current_coord):
-                    current_coord = self.get_cell(
-                        Coordinates.at_the_top_of(current_coord)
-                    ).coordinates
-
-                elif end_coord.is_at_the_bottom_of(current_coord):
-                    current_coord = self.get_cell(
-                        Coordinates.at_the_bottom_of(current_coord)
-                    ).coordinates
-
-            elif end_coord.is_horizontaly_aligned(current_coord):
-                if end_coord.is_on_the_left_of(current_coord):
-                    current_coord = self.get_cell(
-                        Coordinates.to_the_left_of(current_coord)
-                    ).coordinates
-
-                elif end_coord.is_on_the_right_of(current_coord):
-                    current_coord = self.get_cell(
-                        Coordinates.to_the_right_of(current_coord)
-                    ).coordinates
-            resp.append(current_coord)
-        resp.pop()
-        return resp
+    def draw_rock(self, start_coord: Coordinates, end_coord: Coordinates) -> None:
+        """Draw the horizontal or vertical line of rock between two cells, included."""
+        for y in range(
+            min(start_coord.y, end_coord.y), max(start_coord.y, end_coord.y) + 1
+        ):
+            for x in range(
+                min(start_coord.x, end_coord.x), max(start_coord.x, end_coord.x) + 1
+            ):
+                self.cells[x, y] = ROCK_VALUE
 
     def from_straight_lines(self, straight_lines: list[list[Coordinates]]) -> "Grid":
+        """Draw the rocks of a cave that is unbounded sideways.
 
-        self.start_min_y = 0
+        Grains fall into the abyss below `start_max_y`, or rest on the floor
+        there when there is one.
+        """
         if self.without_floor:
             self.start_max_y = self._find_start_max_y(straight_lines)
-            self.start_min_x = self._find_start_min_x(straight_lines)
-            self.start_max_x = self._find_start_max_x(straight_lines)
         else:
             self.start_max_y = self._find_start_max_y(straight_lines, padding=2)
-            self.start_min_x = SAND_SOURCE.x - self.start_max_y
-            self.start_max_x = SAND_SOURCE.x + self.start_max_y
-
-            straight_lines += [
-                [
-                    Coordinates(self.start_min_x, self.start_max_y),
-                    Coordinates(self.start_max_x, self.start_max_y),
-                ]
-            ]
-        self.cells = [
-            [
-                Cell(Coordinates(x, y))
-                for x in range(self.start_min_x, self.start_max_x + 1)
-            ]
-            for y in range(self.start_min_y, self.start_max_y + 1)
-        ]
-        rock_coords = [
-            coords for straight_line in straight_lines for coords in straight_line
-        ]
-
-        rock_coords += [
-            coords
-            for straight_line in straight_lines
-            for i in range(len(straight_line) - 1)
-            for coords in self.find_cells_between(
-                straight_line[i], straight_line[i + 1]
-            )
-        ]
-
-        for coord in set(rock_coords):
-            self.get_cell(coord).value = Pixel.ROCK
-
-        self.get_cell(SAND_SOURCE).value = Pixel.SAND_SOURCE
-
-    def _find_start_min_x(
-        self, straight_lines: list[list[Coordinates]], padding: int = 1
-    ) -> int:
-        return (
-            min(
-                coordinates.x
-                for straight_line in straight_lines
-                for coordinates in straight_line
-            )
-            - padding
-        )
-
-    def _find_start_max_x(
-        self, straight_lines: list[list[Coordinates]], padding: int = 1
-    ) -> int:
-        return (
-            max(
-                coordinates.x
-                for straight_line in straight_lines
-                for coordinates in straight_line
-            )
-            + padding
-        )
+        self.cells = SparseGrid(default=AIR_VALUE)
+        for straight_line in straight_lines:
+            for start_coord, end_coord in pairwise(straight_line):
+                self.draw_rock(start_coord, end_coord)
+            if len(straight_line) == 1:
+                self.draw_rock(straight_line[0], straight_line[0])
+
+        self.cells[SAND_SOURCE] = SAND_SOURCE_VALUE
+        # Cells fallen through by the last grain, from the source to where it stopped
+        self.path = [SAND_SOURCE]
+        return self
 
     def _find_start_max_y(
         self, straight_lines: list[list[Coordinates]], padding: int = 1
@@ -160,40 +83,38 @@ class Grid:
             + padding
         )
 
-    def fall_sand(self, cell: Cell):
-        cell_coords = cell.coordinates
-
-        for get_adjacent_coords_of in (
-            Coordinates.at_the_bottom_of,
-            Coordinates.at_the_bottom_left_of,
-            Coordinates.at_the_bottom_right_of,
-        ):
-            get_adjacent_coords_of: callable
-            cell_below_coords: Coordinates = get_adjacent_coords_of(cell_coords)
-            if not cell_below_coords.is_valid(
-                width=self.start_max_x + 1, height=self.start_max_y + 1
-            ):
-                cell.value = Pixel.FLOWING_SAND
-                return False
-            cell_below = self.get_cell(cell_below_coords)
-            if cell_below.is_traversable():
-                if cell.value != Pixel.SAND_SOURCE:
-                    cell.value = Pixel.FLOWING_SAND
-                cell_below.value = Pixel.SAND
-                return self.fall_sand(cell_below)
-
-        if cell.value == Pixel.SAND_SOURCE:
-            cell.value = Pixel.SAND
-            return True
-        return True
-
-    def put_sand(self):
-        cell = self.get_cell(SAND_SOURCE)
-        if cell.value == Pixel.SAND:
+    def put_sand(self) -> bool:
+        """Drop a grain of sand and tell whether it came to rest.
+
+        A grain falls along the same cells as the previous one until it reaches
+        the cell where that one stopped, so it starts from the last cell of the
+        previous path instead of the source. The path is kept as a stack.
+        """
+        cells = self.cells
+        path = self.path
+        floor = None if self.without_floor else self.start_max_y
+        if not path:
             return False
-        return self.fall_sand(cell)
-
-
+        x, y = path[-1]
+        while True:
+            if floor is None and y >= self.start_max_y:
+                return False
+            moved = False
+            if y + 1 != floor:
+                for next_x in (x, x - 1, x + 1):
+                    if cells[next_x, y + 1] in (AIR_VALUE, FLOWING_SAND_VALUE):
+                        x, y = next_x, y + 1
+                        cells[x, y] = FLOWING_SAND_VALUE
+                        path.append(Coordinates(x, y))
+                        moved = True
+                        break
+            if not moved:
+                cells[x, y] = SAND_VALUE
+                path.pop()
+                return True
+
+
+@parse_once
 def read_input_file_as_straight_line() -> Iterator[list[Coordinates]]:
     with open(INPUT_FILE) as f:
         for line in f.read().splitlines():
@@ -203,7 +124,44 @@ def read_input_file_as_straight_line() -> Iterator[list[Coordinates]]:
             ]
 
 
+def count_sand_cells_above_floor(straight_lines: list[list[Coordinates]]) -> int:
+    """Count the grains that come to rest when there is a floor, without dropping any.
+
+    With a floor, the grains fill every cell that can be reached from the source
+    by moving down, down-left or down-right without crossing rock. Each row is a
+    bitset, bit `i` standing for `x = SAND_SOURCE.x - floor + i`, so a row is
+    reached from the one above with a few shifts over the whole row at once.
+    """
+    floor = max(
+        coords.y for straight_line in straight_lines for coords in straight_line
+    )
+    floor += 2
+    offset = SAND_SOURCE.x - floor
+    rocks: dict[int, int] = {}
+    for straight_line in straight_lines:
+        for start_coord, end_coord in pairwise(straight_line + straight_line[-1:]):
+            min_x = max(min(start_coord.x, end_coord.x) - offset, 0)
+            max_x = min(max(start_coord.x, end_coord.x) - offset, 2 * floor)
+            if min_x > max_x:
+                continue
+            mask = ((1 << (max_x - min_x + 1)) - 1) << min_x
+            for y in range(
+                min(start_coord.y, end_coord.y), max(start_coord.y, end_coord.y) + 1
+            ):
+                rocks[y] = rocks.get(y, 0) | mask
+
+    reached = 1 << (SAND_SOURCE.x - offset)
+    total = 0
+    for y in range(SAND_SOURCE.y, floor):
+        if y > SAND_SOURCE.y:
+            reached = (reached | reached << 1 | reached >> 1) & ~rocks.get(y, 0)
+        total += reached.bit_count()
+    return total
+
+
 def number_of_sand_cells(grid: Grid, print_mode=False):
+    if not grid.without_floor and not print_mode:
+        return count_sand_cells_above_floor(list(read_input_file_as_straight_line()))
     grid.from_straight_lines(list(read_input_file_as_straight_line()))
     i = 0
     while grid.put_sand():
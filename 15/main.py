@@ -1,12 +1,17 @@
 import re
 from aoctools.grid import Coordinates
-from itertools import pairwise
-from collections import OrderedDict as odict
+from aoctools.cache import parse_once
+from aoctools.intervals import IntervalSet
+from bisect import insort
+from collections import defaultdict
+from itertools import chain
+from typing import Iterable, Iterator, NamedTuple
 
 INPUT_FILE = "15/input.txt"
 LIMIT = 4000000
 
 
+@parse_once
 def read_input_file() -> tuple[Coordinates, Coordinates]:
     with open(INPUT_FILE) as f:
         for line in f.read().splitlines():
@@ -26,54 +31,203 @@ def find_manhattan_distance(
     )
 
 
-def find_segments_on_y_axis(
-    y: int, sensors: list[Coordinates], beacons: list[Coordinates]
-) -> tuple[Coordinates, Coordinates]:
-    res = []
-    res_2 = {}
-    for sensor, beacon in zip(sensors, beacons):
-        sensor: Coordinates
-        beacon: Coordinates
-        distance = find_manhattan_distance(sensor, beacon)
-
-        if sensor.y > y:
-            orthogonal_pivot = Coordinates(sensor.x, sensor.y - distance)
-        elif sensor.y <= y:
-            orthogonal_pivot = Coordinates(sensor.x, sensor.y + distance)
-
-        if min(orthogonal_pivot.y, sensor.y) <= y <= max(orthogonal_pivot.y, sensor.y):
-            n = abs(orthogonal_pivot.y - y)
-            start = Coordinates(orthogonal_pivot.x - n, y)
-            end = Coordinates(orthogonal_pivot.x + n + 1, y)
-            # print(start, end)
-            if res_2.get(start):
-                res_2[start].append(end)
-            else:
-                res_2[start] = [end]
-    res_2 = odict(sorted(res_2.items()))
-    start_tmp = None
-    end_tmp = None
-    res_3 = []
-    for k, v in res_2.items():
-        if not start_tmp:
-            start_tmp = k
-            end_tmp = max(v)
-        elif k <= end_tmp:
-            if k <= start_tmp:
-                end_tmp = max(v)
-            else:
-                end_tmp = max(end_tmp, max(v))
+class Sensor(NamedTuple):
+    x: int
+    y: int
+    radius: int
+
+    @classmethod
+    def from_beacon(cls, sensor: Coordinates, beacon: Coordinates) -> "Sensor":
+        return cls(sensor.x, sensor.y, find_manhattan_distance(sensor, beacon))
+
+    def covers(self, x: int, y: int) -> bool:
+        return abs(x - self.x) + abs(y - self.y) <= self.radius
+
+    def get_edges(self) -> Iterator[tuple[int, int, int, int, int]]:
+        """Yield the 4 sides of the diamond just outside the sensor's range.
+
+        Each side is `(x, y, dx, dy, length)`: its points are
+        `(x + t * dx, y + t * dy)` for `0 <= t < length`.
+        """
+        distance = self.radius + 1
+        yield self.x, self.y - distance, 1, 1, distance
+        yield self.x + distance, self.y, -1, 1, distance
+        yield self.x, self.y + distance, -1, -1, distance
+        yield self.x - distance, self.y, 1, -1, distance
+
+
+def get_sensors(sensors: list[Coordinates], beacons: list[Coordinates]) -> list[Sensor]:
+    return [
+        Sensor.from_beacon(sensor, beacon) for sensor, beacon in zip(sensors, beacons)
+    ]
+
+
+def get_coverage_on_row(y: int, sensors: list[Sensor]) -> IntervalSet:
+    """Return the x ranges of row `y` that are within some sensor's range."""
+    covered = IntervalSet()
+    for sensor in sensors:
+        half_width = sensor.radius - abs(y - sensor.y)
+        if half_width >= 0:
+            covered.add(sensor.x - half_width, sensor.x + half_width + 1)
+    return covered
+
+
+class RowCoverage(NamedTuple):
+    y: int
+    length: int
+    gaps: list[tuple[int, int]]
+
+
+def get_spans_on_row(y: int, sensors: list[Sensor]) -> list[list[int]]:
+    """Return the `[start, end, sensor_y]` span of each sensor reaching row `y`, by start."""
+    spans = []
+    for sensor in sensors:
+        half_width = sensor.radius - abs(y - sensor.y)
+        if half_width >= 0:
+            spans.append([sensor.x - half_width, sensor.x + half_width + 1, sensor.y])
+    spans.sort()
+    return spans
+
+
+def move_spans_to_row(
+    y: int, spans: list[list[int]], entering: dict[int, list[Sensor]]
+) -> list[list[int]]:
+    """Update the spans of row `y - 1` in place to get the spans of row `y`.
+
+    Each span widens by one on both sides until the row reaches its sensor,
+    then narrows by one, so the spans stay nearly sorted and an insertion sort
+    puts them back in order in about linear time.
+    """
+    moved = []
+    for span in spans:
+        if y <= span[2]:
+            span[0] -= 1
+            span[1] += 1
         else:
-            res_3.append([start_tmp, end_tmp])
-            start_tmp = k
-            end_tmp = max(v)
-    res_3.append([start_tmp, end_tmp])
-    res = []
-    [res.append(item) for item in res_3]
-    for start_pivot, end_pivot in res:
-        if start_pivot.x == end_pivot.x:
-            continue
-        yield (start_pivot, end_pivot)
+            span[0] += 1
+            span[1] -= 1
+        if span[0] < span[1]:
+            moved.append(span)
+    for i in range(1, len(moved)):
+        span = moved[i]
+        j = i
+        while j and moved[j - 1][0] > span[0]:
+            moved[j] = moved[j - 1]
+            j -= 1
+        moved[j] = span
+    for sensor in entering.get(y, ()):
+        insort(moved, [sensor.x, sensor.x + 1, sensor.y])
+    return moved
+
+
+def get_coverage_on_rows(
+    rows: Iterable[int],
+    sensors: list[Sensor],
+    bounds: tuple[int, int] | None = None,
+) -> Iterator[RowCoverage]:
+    """Yield the covered length and the gaps of each row.
+
+    Spans are updated from one row to the next when rows are consecutive (e.g.
+    a `range`), and only rebuilt when a row is not the previous one plus one.
+
+    :param rows: Rows to report, in any order.
+    :param sensors: Sensors covering the rows.
+    :param bounds: Optional `[lo, hi)` x range to restrict the report to. Without
+        it, the gaps are the holes between the first and last covered points.
+    """
+    entering = defaultdict(list)
+    for sensor in sensors:
+        entering[sensor.y - sensor.radius].append(sensor)
+    spans = None
+    previous = None
+    for y in rows:
+        if previous is not None and y == previous + 1:
+            spans = move_spans_to_row(y, spans, entering)
+        else:
+            spans = get_spans_on_row(y, sensors)
+        previous = y
+        covered = IntervalSet.from_sorted((start, end) for start, end, _ in spans)
+        if bounds is None:
+            intervals = list(covered)
+            lo, hi = (intervals[0][0], intervals[-1][1]) if intervals else (0, 0)
+        else:
+            lo, hi = bounds
+            covered = covered.clip(lo, hi)
+        yield RowCoverage(y, covered.length, list(covered.gaps(lo, hi)))
+
+
+def is_covered(sensors: list[Sensor], x: int, y: int) -> bool:
+    return any(sensor.covers(x, y) for sensor in sensors)
+
+
+def find_uncovered_points_between_sensors(
+    sensors: list[Sensor], limit: int
+) -> Iterator[Coordinates]:
+    """Yield uncovered points lying in the 1-wide gaps between two sensors' ranges.
+
+    The lines `x + y = c` and `x - y = c` just outside each range are collected.
+    A line running just outside two ranges, one on each side, is a 1-wide gap;
+    an uncovered point of the square usually sits where two such gaps cross,
+    which leaves a handful of candidates to check in O(S^2).
+    """
+    sums_before = {sensor.x + sensor.y - sensor.radius - 1 for sensor in sensors}
+    sums_after = {sensor.x + sensor.y + sensor.radius + 1 for sensor in sensors}
+    differences_before = {sensor.x - sensor.y - sensor.radius - 1 for sensor in sensors}
+    differences_after = {sensor.x - sensor.y + sensor.radius + 1 for sensor in sensors}
+    for total in sums_before & sums_after:
+        for difference in differences_before & differences_after:
+            if (total + difference) % 2:
+                continue
+            x, y = (total + difference) // 2, (total - difference) // 2
+            if 0 <= x <= limit and 0 <= y <= limit and not is_covered(sensors, x, y):
+                yield Coordinates(x, y)
+
+
+def find_uncovered_points_along_edges(
+    sensors: list[Sensor], limit: int
+) -> Iterator[Coordinates]:
+    """Yield the first uncovered point of the square on each side of each diamond.
+
+    An isolated uncovered point has a covered neighbour, so it lies just outside
+    some sensor's range. Along a diagonal side, each sensor covers one interval,
+    which is found in O(1): sorting them finds the gaps in O(S^2 log S) overall.
+    This also handles points on the border of the square or in gaps that only
+    run along one diagonal, which `find_uncovered_points_between_sensors` misses.
+    """
+    for sensor in sensors:
+        for x, y, dx, dy, length in sensor.get_edges():
+            # Keep the points of the side that are inside the square
+            start, end = 0, length - 1
+            for origin, direction in ((x, dx), (y, dy)):
+                if direction > 0:
+                    start, end = max(start, -origin), min(end, limit - origin)
+                else:
+                    start, end = max(start, origin - limit), min(end, origin)
+            if start > end:
+                continue
+            covered = IntervalSet()
+            for other in sensors:
+                # Distance to other along the side is |t + u| + |t + v|
+                u, v = (x - other.x) * dx, (y - other.y) * dy
+                if abs(u - v) <= other.radius:
+                    covered.add(
+                        -((other.radius + u + v) // 2),
+                        (other.radius - u - v) // 2 + 1,
+                    )
+            for t, _ in covered.gaps(start, end + 1):
+                yield Coordinates(x + t * dx, y + t * dy)
+                break
+
+
+def find_distress_beacon(sensors: list[Sensor], limit: int) -> Coordinates | None:
+    """Find the point of `[0, limit]^2` that no sensor covers, independently of `limit`."""
+    return next(
+        chain(
+            find_uncovered_points_between_sensors(sensors, limit),
+            find_uncovered_points_along_edges(sensors, limit),
+        ),
+        None,
+    )
 
 
 def get_coords_with_y_equals(y: int, coords: list[Coordinates]) -> list[Coordinates]:
@@ -84,36 +238,20 @@ def part_one() -> int:
     """https://adventofcode.com/2022/day/15"""
     y = LIMIT // 2
     sensors, beacons = zip(*list(read_input_file()))
-    d = 0
+    covered = get_coverage_on_row(y, get_sensors(sensors, beacons))
+    d = covered.length
     d -= len(get_coords_with_y_equals(y, sensors))
     d -= len(get_coords_with_y_equals(y, beacons))
-    for start_pivot, end_pivot in find_segments_on_y_axis(y, sensors, beacons):
-        d += find_manhattan_distance(start_pivot, end_pivot)
     return d
 
 
 def part_two() -> int:
     """https://adventofcode.com/2022/day/15#part2"""
-    y = 3204480
     sensors, beacons = zip(*list(read_input_file()))
-    for y in range(0, LIMIT + 1):
-        d = 0
-        tmp = []
-        for start_pivot, end_pivot in find_segments_on_y_axis(y, sensors, beacons):
-            if end_pivot.x < 0:
-                continue
-            if start_pivot.x < 0:
-                start_pivot = Coordinates(0, start_pivot.y)
-            if start_pivot.x > LIMIT:
-                break
-            if end_pivot.x > LIMIT:
-                end_pivot = Coordinates(LIMIT, end_pivot.y)
-            d += find_manhattan_distance(start_pivot, end_pivot)
-            tmp.append([start_pivot, end_pivot])
-        if d != LIMIT:
-            result = tmp[0][1]
-            return result.x * 4000000 + result.y
-    return -1
+    distress_beacon = find_distress_beacon(get_sensors(sensors, beacons), LIMIT)
+    if distress_beacon is None:
+        return -1
+    return distress_beacon.x * 4000000 + distress_beacon.y
 
 
 if __name__ == "__main__":
@@ -0,0 +1,143 @@
+import argparse
+import json
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from aoctools.cache import clear_parsed_inputs
+from aoctools.run import PARTS, find_days, load_day, parse_days
+
+SYNTHETIC_INPUTS = Path("benchmarks/inputs")
+BASELINE_FILE = Path("benchmarks/baseline.json")
+
+
+@dataclass
+class Timing:
+    """Statistics over the repeated runs of one part of one day."""
+
+    min: float
+    median: float
+    p95: float
+    runs: int
+
+    @classmethod
+    def from_samples(cls, samples: list[float]) -> "Timing":
+        samples = sorted(samples)
+        p95 = samples[min(len(samples) - 1, round(0.95 * (len(samples) - 1)))]
+        return cls(samples[0], statistics.median(samples), p95, len(samples))
+
+
+def get_key(day: int, part: str) -> str:
+    return f"{day:02}/{part}"
+
+
+def benchmark_day(
+    day: int, root: Path, inputs: Path | None, repeat: int
+) -> dict[str, Timing]:
+    """Time each part of a day over repeated runs.
+
+    :param day: Day to benchmark.
+    :param root: Project root.
+    :param inputs: Optional folder holding alternative inputs.
+    :param repeat: Number of runs per part.
+    :return: Timings by `NN/part` key.
+    """
+    module = load_day(day, root, inputs)
+    timings = {}
+    for part in PARTS:
+        solve = getattr(module, part)
+        samples = []
+        for _ in range(repeat):
+            clear_parsed_inputs()
+            start = time.perf_counter()
+            solve()
+            samples.append(time.perf_counter() - start)
+        timings[get_key(day, part)] = Timing.from_samples(samples)
+    return timings
+
+
+def find_regressions(
+    timings: dict[str, Timing], baseline: dict[str, dict], threshold: float
+) -> list[str]:
+    """Return the keys whose median is slower than the baseline by more than `threshold`.
+
+    :param timings: Current timings.
+    :param baseline: Stored timings, as written by `save_baseline`.
+    :param threshold: Allowed relative slowdown, e.g. 0.25 for 25%.
+    :return: Regressed keys.
+    """
+    return [
+        key
+        for key, timing in timings.items()
+        if key in baseline and timing.median > baseline[key]["median"] * (1 + threshold)
+    ]
+
+
+def load_baseline(path: Path) -> dict[str, dict]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def save_baseline(path: Path, timings: dict[str, Timing]) -> None:
+    baseline = load_baseline(path)
+    baseline.update({key: asdict(timing) for key, timing in timings.items()})
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(dict(sorted(baseline.items())), indent=2) + "\n")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark each day's parts against a stored baseline."
+    )
+    parser.add_argument("days", nargs="?", default="all", help="e.g. 1-15 or 3,7,11")
+    parser.add_argument("-n", "--repeat", type=int, default=5)
+    parser.add_argument("--root", type=Path, default=Path("."), help="Project root")
+    parser.add_argument(
+        "--inputs",
+        type=Path,
+        default=SYNTHETIC_INPUTS,
+        help="Folder holding NN/input.txt files, 'none' for the real puzzle inputs",
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="Allowed relative slowdown"
+    )
+    parser.add_argument(
+        "--save", action="store_true", help="Write the results to the baseline file"
+    )
+    args = parser.parse_args()
+
+    root = args.root.resolve()
+    days = parse_days(args.days, find_days(root))
+    inputs = None if str(args.inputs) == "none" else (root / args.inputs).resolve()
+    baseline = load_baseline(args.baseline)
+
+    timings: dict[str, Timing] = {}
+    print(f"{'key':<12}  {'min':>9}  {'median':>9}  {'p95':>9}  {'baseline':>9}")
+    for day in days:
+        for key, timing in benchmark_day(day, root, inputs, args.repeat).items():
+            timings[key] = timing
+            reference = baseline.get(key, {}).get("median")
+            print(
+                f"{key:<12}  {timing.min:>8.4f}s  {timing.median:>8.4f}s  {timing.p95:>8.4f}s  "
+                + (f"{reference:>8.4f}s" if reference is not None else f"{'-':>9}")
+            )
+
+    if args.save or not baseline:
+        save_baseline(args.baseline, timings)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    regressions = find_regressions(timings, baseline, args.threshold)
+    for key in regressions:
+        print(
+            f"REGRESSION {key}: median {timings[key].median:.4f}s "
+            f"> {baseline[key]['median']:.4f}s + {args.threshold:.0%}"
+        )
+    return int(bool(regressions))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
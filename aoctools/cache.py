@@ -0,0 +1,145 @@
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable
+
+# Opt-in persistent cache: set this variable to the folder storing parsed inputs
+CACHE_DIR_VARIABLE = "AOC_CACHE_DIR"
+
+_parsed_inputs: dict[tuple, Any] = {}
+
+
+def get_input_file(parser: Callable) -> str:
+    """Return the input file read by a parser, i.e. the `INPUT_FILE` of its module."""
+    return parser.__globals__["INPUT_FILE"]
+
+
+def get_cache_dir() -> Path | None:
+    """Return the folder of the persistent cache, or None when it is disabled."""
+    cache_dir = os.environ.get(CACHE_DIR_VARIABLE)
+    return Path(cache_dir) if cache_dir else None
+
+
+def get_digest(parser: Callable, input_file: str) -> str:
+    """Hash the input file together with the source of the parser's module.
+
+    The whole module is hashed, as the parsed structure is built from the
+    classes it defines, and so is `aoctools` (e.g. `Coordinates`): editing
+    either the input or the parser invalidates the cached entry.
+    """
+    digest = hashlib.sha256()
+    with open(input_file, "rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    digest.update(inspect.getsource(sys.modules[parser.__module__]).encode())
+    for source_file in sorted(Path(__file__).parent.glob("*.py")):
+        digest.update(source_file.read_bytes())
+    return digest.hexdigest()
+
+
+def get_cache_file(cache_dir: Path, parser: Callable, key: tuple) -> Path:
+    _, input_file, _, *arguments = key
+    name = hashlib.sha256(repr((Path(input_file).resolve(), arguments)).encode())
+    return (
+        cache_dir
+        / f"{parser.__module__}.{parser.__qualname__}.{name.hexdigest()[:16]}.pickle"
+    )
+
+
+def load_from_disk(cache_file: Path, digest: str) -> tuple[bool, Any]:
+    """Load a parsed input, unless it is missing, unreadable or stale.
+
+    :return: Whether the entry was found and up to date, and its content.
+    """
+    try:
+        with cache_file.open("rb") as f:
+            stored_digest, result = pickle.load(f)
+    except Exception:
+        return False, None
+    return stored_digest == digest, result
+
+
+def save_to_disk(cache_file: Path, digest: str, result: Any) -> None:
+    """Store a parsed input, replacing any stale entry of the same parser and input.
+
+    Structures that cannot be pickled (e.g. too deeply linked) are not cached.
+    """
+    try:
+        content = pickle.dumps((digest, result), protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, RecursionError, TypeError, AttributeError):
+        return
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+    tmp_file.write_bytes(content)
+    os.replace(tmp_file, cache_file)
+
+
+def parse(parser: Callable, key: tuple, args: tuple, kwargs: dict) -> Any:
+    """Run a parser, going through the persistent cache when it is enabled."""
+    is_generator = inspect.isgeneratorfunction(parser)
+    if cache_dir := get_cache_dir():
+        cache_file = get_cache_file(cache_dir, parser, key)
+        digest = get_digest(parser, key[1])
+        found, result = load_from_disk(cache_file, digest)
+        if found:
+            return result
+    result = parser(*args, **kwargs)
+    if is_generator:
+        result = list(result)
+    if cache_dir:
+        save_to_disk(cache_file, digest, result)
+    return result
+
+
+def parse_once(
+    parser: Callable = None, *, copy_with: Callable[[Any], Any] | None = None
+) -> Callable:
+    """Parse each input file once per process and share the result between parts.
+
+    The cache is keyed by the parser function itself, its arguments and the
+    current `INPUT_FILE` of its module, so the runner can still point a day to
+    another input, and a module executed again gets structures built from its
+    own classes rather than from those of the previous execution.
+    Generator parsers are materialized once and a fresh iterator is returned on
+    each call. When a part mutates the parsed structure, `copy_with` gives each
+    call its own copy of it (e.g. `copy.deepcopy`, or a cheaper function that
+    only copies the mutated parts).
+
+    When the `AOC_CACHE_DIR` environment variable is set, parsed structures are
+    also pickled there and reused by later processes, see `get_digest`.
+
+    :param parser: Function reading `INPUT_FILE`.
+    :param copy_with: Function copying the cached structure for each call.
+    """
+    if parser is None:
+        return lambda parser: parse_once(parser, copy_with=copy_with)
+
+    is_generator = inspect.isgeneratorfunction(parser)
+
+    @wraps(parser)
+    def wrapper(*args, **kwargs):
+        input_file = get_input_file(parser)
+        key = (
+            parser,
+            input_file,
+            os.stat(input_file).st_mtime_ns,
+            args,
+            tuple(sorted(kwargs.items())),
+        )
+        if key not in _parsed_inputs:
+            _parsed_inputs[key] = parse(parser, key, args, kwargs)
+        result = _parsed_inputs[key]
+        if copy_with is not None:
+            result = copy_with(result)
+        return iter(result) if is_generator else result
+
+    return wrapper
+
+
+def clear_parsed_inputs() -> None:
+    """Forget every parsed input kept in memory, e.g. before timing a cold run."""
+    _parsed_inputs.clear()
@@ -1,42 +1,46 @@
-from dataclasses import dataclass
+from typing import Iterable, Iterator, NamedTuple
 
 
-@dataclass
-class Coordinates:
+class Coordinates(NamedTuple):
+    """Immutable grid coordinates.
+
+    Backed by a tuple: hashing, equality and ordering (x first, then y) run in C.
+    """
+
     x: int
     y: int
 
     @classmethod
     def to_the_left_of(cls, other: "Coordinates") -> "Coordinates":
-        return cls(x=other.x - 1, y=other.y)
+        return cls(other.x - 1, other.y)
 
     @classmethod
     def at_the_top_of(cls, other: "Coordinates") -> "Coordinates":
-        return cls(x=other.x, y=other.y - 1)
+        return cls(other.x, other.y - 1)
 
     @classmethod
     def to_the_right_of(cls, other: "Coordinates") -> "Coordinates":
-        return cls(x=other.x + 1, y=other.y)
+        return cls(other.x + 1, other.y)
 
     @classmethod
     def at_the_bottom_of(cls, other: "Coordinates") -> "Coordinates":
-        return cls(x=other.x, y=other.y + 1)
+        return cls(other.x, other.y + 1)
 
     @classmethod
     def at_the_top_left_of(cls, other: "Coordinates") -> "Coordinates":
-        return cls(x=other.x - 1, y=other.y - 1)
+        return cls(other.x - 1, other.y - 1)
 
     @classmethod
     def at_the_top_right_of(cls, other: "Coordinates") -> "Coordinates":
-        return cls(x=other.x + 1, y=other.y - 1)
+        return cls(other.x + 1, other.y - 1)
 
     @classmethod
     def at_the_bottom_left_of(cls, other: "Coordinates") -> "Coordinates":
-        return cls(x=other.x - 1, y=other.y + 1)
+        return cls(other.x - 1, other.y + 1)
 
     @classmethod
     def at_the_bottom_right_of(cls, other: "Coordinates") -> "Coordinates":
-        return cls(x=other.x + 1, y=other.y + 1)
+        return cls(other.x + 1, other.y + 1)
 
     def is_verticaly_aligned(self, other: "Coordinates") -> bool:
         return self.x == other.x
@@ -76,19 +80,262 @@ class Coordinates:
     def __str__(self) -> str:
         return f"[{self.x};{self.y}]"
 
-    def __eq__(self, other) -> bool:
-        if not isinstance(other, Coordinates):
-            return False
-        return self.x == other.x and self.y == other.y
-
     def __repr__(self) -> str:
         return self.__str__()
 
-    def __hash__(self):
-        return hash((self.x, self.y))
 
-    def __lt__(self, other):
-        return self.x < other.x or (self.x == other.x and self.y < other.y)
+class CoordinatesPool:
+    """Interned Coordinates of a bounded grid.
+
+    Every Coordinates inside `width` x `height` is allocated once; calling the
+    pool returns the shared instance instead of a new one.
+    """
+
+    __slots__ = ("width", "height", "coordinates")
+
+    def __init__(self, width: int, height: int = None) -> None:
+        if height is None:
+            height = width
+        self.width = width
+        self.height = height
+        self.coordinates = [
+            Coordinates(x, y) for y in range(height) for x in range(width)
+        ]
+
+    def __call__(self, x: int, y: int) -> Coordinates:
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.coordinates[y * self.width + x]
+        return Coordinates(x, y)
+
+    def to_the_left_of(self, other: Coordinates) -> Coordinates:
+        return self(other.x - 1, other.y)
+
+    def at_the_top_of(self, other: Coordinates) -> Coordinates:
+        return self(other.x, other.y - 1)
+
+    def to_the_right_of(self, other: Coordinates) -> Coordinates:
+        return self(other.x + 1, other.y)
+
+    def at_the_bottom_of(self, other: Coordinates) -> Coordinates:
+        return self(other.x, other.y + 1)
+
+
+class DenseGrid:
+    """Rectangular grid of byte values, stored row by row in one bytearray.
+
+    Cells are addressed by flat index `y * width + x`, so a cell costs one byte
+    and whole rows or columns are sliced at C speed.
+    """
+
+    __slots__ = ("width", "height", "cells")
+
+    def __init__(self, width: int, height: int, cells: bytearray = None) -> None:
+        if cells is None:
+            cells = bytearray(width * height)
+        elif len(cells) != width * height:
+            raise ValueError(f"Expected {width * height} cells, got {len(cells)}")
+        self.width = width
+        self.height = height
+        self.cells = cells
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str], table: bytes = None) -> "DenseGrid":
+        """Create a grid from lines of text, one byte per character.
+
+        :param lines: Lines of the same length.
+        :param table: Optional `bytes.maketrans` table mapping characters to values.
+        """
+        rows = [line.encode() for line in lines]
+        width = len(rows[0]) if rows else 0
+        if any(len(row) != width for row in rows):
+            raise ValueError("All lines must have the same length")
+        cells = bytearray().join(rows)
+        if table is not None:
+            cells = cells.translate(table)
+        return cls(width, len(rows), cells)
+
+    def index(self, x: int, y: int) -> int:
+        return y * self.width + x
+
+    def coordinates(self, index: int) -> Coordinates:
+        y, x = divmod(index, self.width)
+        return Coordinates(x, y)
+
+    def is_valid(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def neighbors(self, index: int, diagonal: bool = False) -> list[int]:
+        """Return the flat indices of the cells around `index` that are inside the grid.
 
-    def __le__(self, other):
-        return self.x < other.x or (self.x == other.x and self.y <= other.y)
+        Orthogonal neighbors come first, in left, top, right, bottom order.
+        """
+        width = self.width
+        y, x = divmod(index, width)
+        left, top = x > 0, y > 0
+        right, bottom = x < width - 1, y < self.height - 1
+        result = []
+        if left:
+            result.append(index - 1)
+        if top:
+            result.append(index - width)
+        if right:
+            result.append(index + 1)
+        if bottom:
+            result.append(index + width)
+        if diagonal:
+            if top and left:
+                result.append(index - width - 1)
+            if top and right:
+                result.append(index - width + 1)
+            if bottom and left:
+                result.append(index + width - 1)
+            if bottom and right:
+                result.append(index + width + 1)
+        return result
+
+    def row(self, y: int) -> memoryview:
+        """Return a writable view of a row."""
+        return memoryview(self.cells)[y * self.width : (y + 1) * self.width]
+
+    def column(self, x: int) -> bytearray:
+        """Return a copy of a column."""
+        return self.cells[x :: self.width]
+
+    def rows(self) -> Iterator[memoryview]:
+        for y in range(self.height):
+            yield self.row(y)
+
+    def columns(self) -> Iterator[bytearray]:
+        for x in range(self.width):
+            yield self.column(x)
+
+    def find(self, value: int) -> int:
+        """Return the flat index of the first cell holding `value`, or -1."""
+        return self.cells.find(value)
+
+    def __getitem__(self, key: int | Coordinates) -> int:
+        if isinstance(key, tuple):
+            key = key[1] * self.width + key[0]
+        return self.cells[key]
+
+    def __setitem__(self, key: int | Coordinates, value: int) -> None:
+        if isinstance(key, tuple):
+            key = key[1] * self.width + key[0]
+        self.cells[key] = value
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __str__(self) -> str:
+        return "\n".join(bytes(row).decode("latin-1") for row in self.rows())
+
+
+class SparseGrid:
+    """Unbounded grid of byte values, stored in square tiles allocated on first write.
+
+    Tiles are bytearrays kept in a dict keyed by tile coordinates, so memory
+    grows with the area actually written to and coordinates may be negative or
+    arbitrarily large. Reading a cell of a missing tile returns `default`.
+    """
+
+    __slots__ = ("default", "tile_size", "tiles")
+
+    def __init__(self, default: int = 0, tile_size: int = 64) -> None:
+        self.default = default
+        self.tile_size = tile_size
+        self.tiles: dict[tuple[int, int], bytearray] = {}
+
+    def __getitem__(self, key: Coordinates) -> int:
+        tile_x, x = divmod(key[0], self.tile_size)
+        tile_y, y = divmod(key[1], self.tile_size)
+        tile = self.tiles.get((tile_x, tile_y))
+        if tile is None:
+            return self.default
+        return tile[y * self.tile_size + x]
+
+    def __setitem__(self, key: Coordinates, value: int) -> None:
+        tile_x, x = divmod(key[0], self.tile_size)
+        tile_y, y = divmod(key[1], self.tile_size)
+        tile = self.tiles.get((tile_x, tile_y))
+        if tile is None:
+            if value == self.default:
+                return
+            tile = self.tiles[tile_x, tile_y] = bytearray([self.default]) * (
+                self.tile_size * self.tile_size
+            )
+        tile[y * self.tile_size + x] = value
+
+    def neighbors(self, x: int, y: int, diagonal: bool = False) -> list[Coordinates]:
+        """Return the cells around `(x, y)`, in the same order as `DenseGrid.neighbors`."""
+        result = [
+            Coordinates(x - 1, y),
+            Coordinates(x, y - 1),
+            Coordinates(x + 1, y),
+            Coordinates(x, y + 1),
+        ]
+        if diagonal:
+            result += [
+                Coordinates(x - 1, y - 1),
+                Coordinates(x + 1, y - 1),
+                Coordinates(x - 1, y + 1),
+                Coordinates(x + 1, y + 1),
+            ]
+        return result
+
+    def occupied_tiles(self) -> Iterator[tuple[Coordinates, bytearray]]:
+        """Yield the coordinates of the top left cell and the content of each tile."""
+        for (tile_x, tile_y), tile in self.tiles.items():
+            yield Coordinates(tile_x * self.tile_size, tile_y * self.tile_size), tile
+
+    def items(self) -> Iterator[tuple[Coordinates, int]]:
+        """Yield the cells whose value is not `default`, tile by tile."""
+        for origin, tile in self.occupied_tiles():
+            for index, value in enumerate(tile):
+                if value != self.default:
+                    y, x = divmod(index, self.tile_size)
+                    yield Coordinates(origin.x + x, origin.y + y), value
+
+    def bounds(self) -> tuple[Coordinates, Coordinates] | None:
+        """Return the top left and bottom right cells holding a value other than `default`."""
+        size = self.tile_size
+        fill = bytes([self.default])
+        xs, ys = [], []
+        for origin, tile in self.occupied_tiles():
+            for y in range(size):
+                row = tile[y * size : (y + 1) * size]
+                if not row.strip(fill):
+                    continue
+                ys.append(origin.y + y)
+                xs.append(origin.x + size - len(row.lstrip(fill)))
+                xs.append(origin.x + len(row.rstrip(fill)) - 1)
+        if not xs:
+            return None
+        return Coordinates(min(xs), min(ys)), Coordinates(max(xs), max(ys))
+
+    def row(self, y: int, x_start: int, x_end: int) -> bytearray:
+        """Return a copy of the cells of row `y` from `x_start` included to `x_end` excluded."""
+        tile_y, offset = divmod(y, self.tile_size)
+        offset *= self.tile_size
+        first_tile = x_start // self.tile_size
+        last_tile = (x_end - 1) // self.tile_size
+        empty = bytearray([self.default]) * self.tile_size
+        row = bytearray().join(
+            (
+                self.tiles[tile_x, tile_y][offset : offset + self.tile_size]
+                if (tile_x, tile_y) in self.tiles
+                else empty
+            )
+            for tile_x in range(first_tile, last_tile + 1)
+        )
+        start = x_start - first_tile * self.tile_size
+        return row[start : start + x_end - x_start]
+
+    def __str__(self) -> str:
+        bounds = self.bounds()
+        if bounds is None:
+            return ""
+        top_left, bottom_right = bounds
+        return "\n".join(
+            self.row(y, top_left.x, bottom_right.x + 1).decode("latin-1")
+            for y in range(top_left.y, bottom_right.y + 1)
+        )
@@ -0,0 +1,128 @@
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator
+
+
+def _merge(intervals: Iterable[tuple[int, int]]) -> tuple[list[int], list[int]]:
+    """Merge intervals sorted by start into the starts and ends of disjoint ones."""
+    starts: list[int] = []
+    ends: list[int] = []
+    for start, end in intervals:
+        if start >= end:
+            continue
+        if ends and start <= ends[-1]:
+            if end > ends[-1]:
+                ends[-1] = end
+        else:
+            starts.append(start)
+            ends.append(end)
+    return starts, ends
+
+
+class IntervalSet:
+    """Union of half-open integer intervals `[start, end)`.
+
+    Intervals are kept merged in two sorted arrays of starts and ends, so
+    membership, clipping and gap queries are `bisect` lookups. Insertions are
+    buffered and merged in one sort the next time the set is read.
+    """
+
+    __slots__ = ("_starts", "_ends", "_pending")
+
+    def __init__(self, intervals: Iterable[tuple[int, int]] = ()) -> None:
+        self._starts: list[int] = []
+        self._ends: list[int] = []
+        self._pending: list[tuple[int, int]] = []
+        self.update(intervals)
+
+    def add(self, start: int, end: int) -> None:
+        if start < end:
+            self._pending.append((start, end))
+
+    def update(self, intervals: Iterable[tuple[int, int]]) -> None:
+        self._pending.extend((start, end) for start, end in intervals if start < end)
+
+    @classmethod
+    def from_sorted(cls, intervals: Iterable[tuple[int, int]]) -> "IntervalSet":
+        """Build a set from intervals already sorted by start, without sorting them."""
+        interval_set = cls()
+        interval_set._starts, interval_set._ends = _merge(intervals)
+        return interval_set
+
+    def _normalize(self) -> None:
+        if not self._pending:
+            return
+        intervals = sorted(self._pending + list(zip(self._starts, self._ends)))
+        self._starts, self._ends = _merge(intervals)
+        self._pending = []
+
+    @property
+    def length(self) -> int:
+        """Number of integers covered by the set."""
+        self._normalize()
+        return sum(self._ends) - sum(self._starts)
+
+    def covers(self, start: int, end: int) -> bool:
+        """Whether every integer of `[start, end)` is in the set."""
+        if start >= end:
+            return True
+        self._normalize()
+        i = bisect_right(self._starts, start) - 1
+        return i >= 0 and end <= self._ends[i]
+
+    def overlaps(self, start: int, end: int) -> bool:
+        """Whether any integer of `[start, end)` is in the set."""
+        if start >= end:
+            return False
+        self._normalize()
+        i = bisect_left(self._ends, start + 1)
+        return i < len(self._starts) and self._starts[i] < end
+
+    def clip(self, lo: int, hi: int) -> "IntervalSet":
+        """Return the part of the set inside `[lo, hi)`, empty when `lo >= hi`."""
+        clipped = IntervalSet()
+        if lo >= hi:
+            return clipped
+        self._normalize()
+        first = bisect_right(self._ends, lo)
+        last = bisect_left(self._starts, hi)
+        clipped._starts = self._starts[first:last]
+        clipped._ends = self._ends[first:last]
+        if clipped._starts:
+            clipped._starts[0] = max(clipped._starts[0], lo)
+            clipped._ends[-1] = min(clipped._ends[-1], hi)
+            if clipped._starts[0] >= clipped._ends[0]:
+                del clipped._starts[0], clipped._ends[0]
+        if clipped._starts and clipped._starts[-1] >= clipped._ends[-1]:
+            del clipped._starts[-1], clipped._ends[-1]
+        return clipped
+
+    def gaps(self, lo: int, hi: int) -> Iterator[tuple[int, int]]:
+        """Yield the intervals of `[lo, hi)` that are not in the set."""
+        clipped = self.clip(lo, hi)
+        position = lo
+        for start, end in zip(clipped._starts, clipped._ends):
+            if start > position:
+                yield position, start
+            position = end
+        if position < hi:
+            yield position, hi
+
+    def __contains__(self, point: int) -> bool:
+        self._normalize()
+        i = bisect_right(self._starts, point) - 1
+        return i >= 0 and point < self._ends[i]
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        self._normalize()
+        return zip(self._starts, self._ends)
+
+    def __bool__(self) -> bool:
+        return bool(self._starts or self._pending)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, IntervalSet):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return f"IntervalSet({list(self)})"
@@ -0,0 +1,266 @@
+import argparse
+import importlib.util
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+from aoctools.cache import CACHE_DIR_VARIABLE
+
+PARTS = ("part_one", "part_two")
+
+# Day modules already loaded by this process, see `get_day`
+_loaded_days: dict[tuple[int, Path, Path | None], ModuleType] = {}
+
+
+@dataclass
+class PartResult:
+    """Answer and timings of one part of one day."""
+
+    day: int
+    part: str
+    answer: Any = None
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    error: str | None = None
+    # Whether another part of the day ran before in the same process, in which
+    # case the parsed input was shared and the times leave parsing out
+    warm: bool = False
+
+    def __str__(self) -> str:
+        answer = self.error if self.error else self.answer
+        lines = str(answer).splitlines() or [""]
+        mark = "*" if self.warm else " "
+        header = f"{self.day:>3}  {self.part:<8}  {self.wall_time:>9.3f}s{mark} {self.cpu_time:>9.3f}s  "
+        return "\n".join(
+            [header + lines[0]] + [" " * len(header) + l for l in lines[1:]]
+        )
+
+
+def get_day_str(day: int) -> str:
+    """Return the day as a string with a leading zero if needed."""
+    return str(day) if day > 9 else f"0{day}"
+
+
+def find_days(root: Path) -> list[int]:
+    """Find every day that has a `NN/main.py` module.
+
+    :param root: Project root.
+    :return: Sorted list of days.
+    """
+    return sorted(
+        int(main_file.parent.name)
+        for main_file in root.glob("[0-9][0-9]/main.py")
+        if 1 <= int(main_file.parent.name) <= 25
+    )
+
+
+def parse_days(spec: str, available: list[int]) -> list[int]:
+    """Parse a day selection such as `1-15`, `3,7,11` or `1-5,12`.
+
+    :param spec: Day selection, `all` for every available day.
+    :param available: Days that exist in the project.
+    :return: Sorted list of selected days.
+    """
+    if spec == "all":
+        return list(available)
+    days: set[int] = set()
+    for chunk in spec.split(","):
+        start, _, end = chunk.partition("-")
+        days.update(range(int(start), int(end or start) + 1))
+    missing = sorted(days.difference(available))
+    if missing:
+        raise ValueError(f"No main.py found for day(s) {missing}")
+    return sorted(days)
+
+
+def get_input_file(day: int, root: Path, inputs: Path | None = None) -> Path:
+    """Return the input file of a day, taken from `inputs` when given."""
+    return (inputs or root) / get_day_str(day) / "input.txt"
+
+
+def load_day(day: int, root: Path, inputs: Path | None = None) -> ModuleType:
+    """Import `NN/main.py` and point it to its input file.
+
+    When `inputs` is given, the input is read from `inputs/NN/input.txt` and the
+    module globals listed in `inputs/NN/globals.json` (if any) are overridden.
+
+    :param day: Day to load.
+    :param root: Project root.
+    :param inputs: Optional folder holding alternative inputs.
+    :return: Day module.
+    """
+    day_str = get_day_str(day)
+    spec = importlib.util.spec_from_file_location(
+        f"day_{day_str}", root / day_str / "main.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    module.INPUT_FILE = str(get_input_file(day, root, inputs))
+    if inputs and (overrides := inputs / day_str / "globals.json").exists():
+        for name, value in json.loads(overrides.read_text()).items():
+            setattr(module, name, value)
+    return module
+
+
+def get_day(
+    day: int, root: Path, inputs: Path | None = None
+) -> tuple[ModuleType, bool]:
+    """Load a day once per process, so that its parts share their parsed input.
+
+    :return: Day module, and whether it was already loaded.
+    """
+    key = day, root, inputs
+    warm = key in _loaded_days
+    if not warm:
+        _loaded_days[key] = load_day(day, root, inputs)
+    return _loaded_days[key], warm
+
+
+def run_part(day: int, part: str, root: Path, inputs: Path | None = None) -> PartResult:
+    """Run one part of one day and measure its wall and CPU times.
+
+    When a part of the same day already ran in this worker, the parsed input is
+    reused and the times do not include parsing, see `PartResult.warm`.
+
+    :param day: Day to run.
+    :param part: `part_one` or `part_two`.
+    :param root: Project root.
+    :param inputs: Optional folder holding alternative inputs.
+    :return: Answer and timings.
+    """
+    module, warm = get_day(day, root, inputs)
+    solve = getattr(module, part)
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    answer = solve()
+    wall_time = time.perf_counter() - wall_start
+    cpu_time = time.process_time() - cpu_start
+    return PartResult(day, part, answer, wall_time, cpu_time, warm=warm)
+
+
+def run_day_standalone(
+    day: int, root: Path, inputs: Path | None = None
+) -> dict[str, Any]:
+    """Run the parts of a day in order, like `python NN/main.py` does.
+
+    :return: Answer of each part.
+    """
+    module = load_day(day, root, inputs)
+    return {part: getattr(module, part)() for part in PARTS}
+
+
+def find_mismatches(
+    results: list[PartResult], root: Path, inputs: Path | None = None
+) -> list[str]:
+    """Check the runner's answers against standalone runs of each day.
+
+    Each day runs in a freshly spawned process, so that nothing is shared with
+    the runner's workers.
+
+    :return: One message per answer that differs.
+    """
+    days = sorted({result.day for result in results})
+    # `max_tasks_per_child` of ProcessPoolExecutor needs Python 3.11
+    with multiprocessing.get_context("spawn").Pool(maxtasksperchild=1) as pool:
+        expected = dict(
+            zip(
+                days,
+                pool.starmap(
+                    run_day_standalone, zip(days, repeat(root), repeat(inputs))
+                ),
+            )
+        )
+    return [
+        f"MISMATCH day {result.day} {result.part}: "
+        f"{result.answer!r} != {expected[result.day][result.part]!r} standalone"
+        for result in results
+        if not result.error and result.answer != expected[result.day][result.part]
+    ]
+
+
+def run_days(
+    days: list[int], root: Path, inputs: Path | None = None, jobs: int | None = None
+) -> list[PartResult]:
+    """Run every part of the selected days across a pool of processes.
+
+    :param days: Days to run.
+    :param root: Project root.
+    :param inputs: Optional folder holding alternative inputs.
+    :param jobs: Number of worker processes, defaults to the number of CPUs.
+    :return: Results sorted by day and part.
+    """
+    futures: dict[tuple[int, str], Future] = {}
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for day in days:
+            for part in PARTS:
+                futures[day, part] = executor.submit(run_part, day, part, root, inputs)
+    results = []
+    for (day, part), future in futures.items():
+        if error := future.exception():
+            results.append(
+                PartResult(day, part, error=f"{type(error).__name__}: {error}")
+            )
+        else:
+            results.append(future.result())
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Run the challenges of several days in parallel."
+    )
+    parser.add_argument("days", nargs="?", default="all", help="e.g. 1-15 or 3,7,11")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count())
+    parser.add_argument("--root", type=Path, default=Path("."), help="Project root")
+    parser.add_argument(
+        "--inputs", type=Path, default=None, help="Folder holding NN/input.txt files"
+    )
+    parser.add_argument(
+        "--disk-cache",
+        type=Path,
+        default=None,
+        help=f"Folder caching parsed inputs across runs (same as ${CACHE_DIR_VARIABLE})",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Check the answers against a standalone run of each day",
+    )
+    args = parser.parse_args()
+
+    if args.disk_cache:
+        os.environ[CACHE_DIR_VARIABLE] = str(args.disk_cache.resolve())
+    root = args.root.resolve()
+    days = parse_days(args.days, find_days(root))
+    inputs = args.inputs.resolve() if args.inputs else None
+
+    start = time.perf_counter()
+    results = run_days(days, root, inputs, args.jobs)
+    wall_time = time.perf_counter() - start
+
+    print(f"{'day':>3}  {'part':<8}  {'wall':>10}  {'cpu':>10}  answer")
+    for result in results:
+        print(result)
+    cpu_time = sum(result.cpu_time for result in results)
+    print(f"total: {wall_time:.3f}s wall, {cpu_time:.3f}s cpu, {args.jobs} jobs")
+    if any(result.warm for result in results):
+        print(
+            "* ran after the other part of its day in the same worker: "
+            "parsing is left out of its times"
+        )
+    mismatches = find_mismatches(results, root, inputs) if args.check else []
+    for mismatch in mismatches:
+        print(mismatch)
+    return int(any(result.error for result in results) or bool(mismatches))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
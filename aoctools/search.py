@@ -0,0 +1,201 @@
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from heapq import heappop, heappush
+from typing import Callable, Iterable
+
+from aoctools.grid import DenseGrid
+
+UNREACHABLE = -1
+
+# can_move(from_index, to_index) tells whether an edge exists
+EdgePredicate = Callable[[int, int], bool]
+# edge_cost(from_index, to_index) returns the cost of an edge, None when there is none
+EdgeCost = Callable[[int, int], int | None]
+
+
+@dataclass
+class SearchResult:
+    """Outcome of a search over the flat indices of a grid."""
+
+    distances: array
+    parents: array | None
+    expansions: int = 0
+
+    def distance_to(self, index: int) -> int:
+        return self.distances[index]
+
+    def path_to(self, index: int) -> list[int]:
+        """Return the cells from a source to `index`, both included.
+
+        :raises ValueError: If parents were not recorded or `index` is unreachable.
+        """
+        if self.parents is None:
+            raise ValueError("Parents were not recorded, search with with_parents=True")
+        if self.distances[index] == UNREACHABLE:
+            raise ValueError(f"Cell {index} is unreachable")
+        path = [index]
+        while (index := self.parents[index]) != UNREACHABLE:
+            path.append(index)
+        return path[::-1]
+
+
+def _init(
+    grid: DenseGrid, sources: int | Iterable[int], with_parents: bool
+) -> tuple[list[int], array, array | None]:
+    sources = [sources] if isinstance(sources, int) else list(sources)
+    distances = array("q", [UNREACHABLE]) * len(grid)
+    parents = array("q", [UNREACHABLE]) * len(grid) if with_parents else None
+    for source in sources:
+        distances[source] = 0
+    return sources, distances, parents
+
+
+def breadth_first_search(
+    grid: DenseGrid,
+    sources: int | Iterable[int],
+    can_move: EdgePredicate = None,
+    targets: Iterable[int] = (),
+    with_parents: bool = False,
+    diagonal: bool = False,
+) -> SearchResult:
+    """Shortest number of steps from the sources to every cell.
+
+    :param grid: Grid whose cells are searched.
+    :param sources: Flat index, or indices, the search starts from.
+    :param can_move: Edge predicate, every neighbour is reachable when None.
+    :param targets: Cells stopping the search as soon as one of them is reached.
+    :param with_parents: Whether to record parents for `SearchResult.path_to`.
+    :param diagonal: Whether diagonal neighbours are connected.
+    """
+    sources, distances, parents = _init(grid, sources, with_parents)
+    targets = set(targets)
+    expansions = 0
+    queue = deque(sources)
+    while queue:
+        index = queue.popleft()
+        if index in targets:
+            break
+        expansions += 1
+        distance = distances[index] + 1
+        for neighbour in grid.neighbors(index, diagonal):
+            if distances[neighbour] != UNREACHABLE:
+                continue
+            if can_move is not None and not can_move(index, neighbour):
+                continue
+            distances[neighbour] = distance
+            if parents is not None:
+                parents[neighbour] = index
+            queue.append(neighbour)
+    return SearchResult(distances, parents, expansions)
+
+
+def zero_one_breadth_first_search(
+    grid: DenseGrid,
+    sources: int | Iterable[int],
+    edge_cost: EdgeCost,
+    targets: Iterable[int] = (),
+    with_parents: bool = False,
+    diagonal: bool = False,
+) -> SearchResult:
+    """Shortest distances when every edge costs 0 or 1, with a double-ended queue.
+
+    Same parameters as `breadth_first_search`, edges being given by `edge_cost`.
+    """
+    sources, distances, parents = _init(grid, sources, with_parents)
+    targets = set(targets)
+    expansions = 0
+    done = bytearray(len(grid))
+    queue = deque(sources)
+    while queue:
+        index = queue.popleft()
+        if done[index]:
+            continue
+        done[index] = 1
+        if index in targets:
+            break
+        expansions += 1
+        for neighbour in grid.neighbors(index, diagonal):
+            cost = edge_cost(index, neighbour)
+            if cost is None or done[neighbour]:
+                continue
+            distance = distances[index] + cost
+            if distances[neighbour] == UNREACHABLE or distance < distances[neighbour]:
+                distances[neighbour] = distance
+                if parents is not None:
+                    parents[neighbour] = index
+                if cost:
+                    queue.append(neighbour)
+                else:
+                    queue.appendleft(neighbour)
+    return SearchResult(distances, parents, expansions)
+
+
+def dijkstra(
+    grid: DenseGrid,
+    sources: int | Iterable[int],
+    edge_cost: EdgeCost,
+    targets: Iterable[int] = (),
+    with_parents: bool = False,
+    diagonal: bool = False,
+    heuristic: Callable[[int], int] = None,
+) -> SearchResult:
+    """Shortest distances with non-negative edge costs, with a binary heap.
+
+    Same parameters as `zero_one_breadth_first_search`. With a `heuristic`
+    (a lower bound of the distance left to the targets) this is A*.
+    """
+    sources, distances, parents = _init(grid, sources, with_parents)
+    targets = set(targets)
+    expansions = 0
+    heap = [(heuristic(source) if heuristic else 0, 0, source) for source in sources]
+    while heap:
+        _, distance, index = heappop(heap)
+        if distance > distances[index]:
+            continue
+        if index in targets:
+            break
+        expansions += 1
+        for neighbour in grid.neighbors(index, diagonal):
+            cost = edge_cost(index, neighbour)
+            if cost is None:
+                continue
+            neighbour_distance = distance + cost
+            if (
+                distances[neighbour] == UNREACHABLE
+                or neighbour_distance < distances[neighbour]
+            ):
+                distances[neighbour] = neighbour_distance
+                if parents is not None:
+                    parents[neighbour] = index
+                priority = neighbour_distance + (
+                    heuristic(neighbour) if heuristic else 0
+                )
+                heappush(heap, (priority, neighbour_distance, neighbour))
+    return SearchResult(distances, parents, expansions)
+
+
+def a_star(
+    grid: DenseGrid,
+    source: int,
+    target: int,
+    edge_cost: EdgeCost,
+    heuristic: Callable[[int], int] = None,
+    with_parents: bool = False,
+    diagonal: bool = False,
+) -> SearchResult:
+    """Shortest distance from `source` to `target`, guided by a heuristic.
+
+    The default heuristic is the Manhattan distance to the target, which is
+    admissible as long as every step costs at least 1 and `diagonal` is False.
+    """
+    if heuristic is None:
+        target_y, target_x = divmod(target, grid.width)
+
+        def heuristic(index: int) -> int:
+            y, x = divmod(index, grid.width)
+            return abs(x - target_x) + abs(y - target_y)
+
+    return dijkstra(
+        grid, source, edge_cost, (target,), with_parents, diagonal, heuristic
+    )
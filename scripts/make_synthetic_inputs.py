@@ -0,0 +1,270 @@
+import argparse
+import json
+import random
+import string
+from collections import deque
+from pathlib import Path
+from typing import Callable
+
+LETTERS = string.ascii_lowercase + string.ascii_uppercase
+
+
+def make_day_01(rng: random.Random) -> str:
+    elves = [
+        "\n".join(str(rng.randint(1000, 9999)) for _ in range(rng.randint(1, 15)))
+        for _ in range(2000)
+    ]
+    # The parser yields an elf on each blank line, so the file ends with one
+    return "\n\n".join(elves) + "\n\n"
+
+
+def make_day_02(rng: random.Random) -> str:
+    return "".join(f"{rng.choice('ABC')} {rng.choice('XYZ')}\n" for _ in range(20000))
+
+
+def make_rucksack(rng: random.Random, pool: list[str], badge: str) -> str:
+    common, *others = rng.sample(pool, len(pool))
+    half = rng.randint(4, 12)
+    left = [common, badge] + rng.choices(others[: len(others) // 2], k=half - 2)
+    right = [common] + rng.choices(others[len(others) // 2 :], k=half - 1)
+    rng.shuffle(left)
+    rng.shuffle(right)
+    return "".join(left + right)
+
+
+def make_day_03(rng: random.Random) -> str:
+    lines = []
+    for _ in range(3000):
+        badge, *others = rng.sample(LETTERS, len(LETTERS))
+        pools = [others[i::3] for i in range(3)]
+        lines += [make_rucksack(rng, pool, badge) for pool in pools]
+    return "\n".join(lines) + "\n"
+
+
+def make_day_04(rng: random.Random) -> str:
+    lines = []
+    for _ in range(20000):
+        a, b, c, d = (rng.randint(1, 99) for _ in range(4))
+        lines.append(f"{min(a, b)}-{max(a, b)},{min(c, d)}-{max(c, d)}")
+    return "\n".join(lines) + "\n"
+
+
+def make_day_05(rng: random.Random) -> str:
+    stacks_number = 9
+    towers = [
+        [rng.choice(string.ascii_uppercase) for _ in range(rng.randint(3, 8))]
+        for _ in range(stacks_number)
+    ]
+    height = max(len(tower) for tower in towers)
+    lines = []
+    for level in reversed(range(height)):
+        lines.append(
+            " ".join(
+                f"[{tower[level]}]" if level < len(tower) else "   " for tower in towers
+            )
+        )
+    lines.append(" ".join(f" {i + 1} " for i in range(stacks_number)))
+    lines.append("")
+    sizes = [len(tower) for tower in towers]
+    for _ in range(5000):
+        source = rng.choice([i for i, size in enumerate(sizes) if size > 1])
+        target = rng.choice([i for i in range(stacks_number) if i != source])
+        move = rng.randint(1, sizes[source] - 1)
+        sizes[source] -= move
+        sizes[target] += move
+        lines.append(f"move {move} from {source + 1} to {target + 1}")
+    return "\n".join(lines) + "\n"
+
+
+def make_day_06(rng: random.Random) -> str:
+    alphabet = string.ascii_lowercase
+    stream = rng.choices(alphabet[:3], k=100000)
+    stream += rng.sample(alphabet, 4)
+    stream += rng.choices(alphabet[:13], k=100000)
+    stream += rng.sample(alphabet, 14)
+    stream += rng.choices(alphabet, k=10000)
+    return "".join(stream) + "\n"
+
+
+def make_day_07(rng: random.Random) -> str:
+    lines = ["$ cd /"]
+
+    def make_directory(depth: int) -> None:
+        directories = [
+            f"d{rng.randint(0, 10**6)}" for _ in range(rng.randint(0, 4 - depth // 3))
+        ]
+        directories = list(dict.fromkeys(directories))
+        files = {
+            f"f{rng.randint(0, 10**6)}.txt": rng.randint(1, 30000)
+            for _ in range(rng.randint(1, 6))
+        }
+        lines.append("$ ls")
+        lines.extend(f"dir {name}" for name in directories)
+        lines.extend(f"{size} {name}" for name, size in files.items())
+        for name in directories:
+            lines.append(f"$ cd {name}")
+            make_directory(depth + 1)
+            lines.append("$ cd ..")
+
+    make_directory(0)
+    return "\n".join(lines) + "\n"
+
+
+def make_day_08(rng: random.Random) -> str:
+    size = 300
+    return "".join(
+        "".join(str(rng.randint(0, 9)) for _ in range(size)) + "\n" for _ in range(size)
+    )
+
+
+def make_day_09(rng: random.Random) -> str:
+    return "".join(f"{rng.choice('UDLR')} {rng.randint(1, 20)}\n" for _ in range(4000))
+
+
+def make_day_10(rng: random.Random) -> str:
+    lines, cycles, register = [], 0, 1
+    while cycles < 240:
+        value = rng.randint(max(-10, -register), min(10, 39 - register))
+        if cycles == 239 or not value or rng.random() < 0.3:
+            lines.append("noop")
+            cycles += 1
+        else:
+            lines.append(f"addx {value}")
+            cycles += 2
+            register += value
+    return "\n".join(lines) + "\n"
+
+
+def make_day_11(rng: random.Random) -> str:
+    divisors = [2, 3, 5, 7, 11, 13, 17, 19]
+    rng.shuffle(divisors)
+    operations = ["* old", "* 19", "* 7"] + [f"+ {rng.randint(1, 8)}" for _ in range(5)]
+    rng.shuffle(operations)
+    monkeys = []
+    for i, (divisor, operation) in enumerate(zip(divisors, operations)):
+        targets = rng.sample([j for j in range(len(divisors)) if j != i], 2)
+        items = ", ".join(str(rng.randint(50, 99)) for _ in range(rng.randint(1, 8)))
+        monkeys.append(
+            f"Monkey {i}:\n"
+            f"  Starting items: {items}\n"
+            f"  Operation: new = old {operation}\n"
+            f"  Test: divisible by {divisor}\n"
+            f"    If true: throw to monkey {targets[0]}\n"
+            f"    If false: throw to monkey {targets[1]}\n"
+        )
+    return "\n".join(monkeys)
+
+
+def is_end_reachable(heights: list[list[int]]) -> bool:
+    width, height = len(heights[0]), len(heights)
+    start, end = (0, height // 2), (width - 1, height // 2)
+    queue, visited = deque([start]), {start}
+    while queue:
+        x, y = queue.popleft()
+        if (x, y) == end:
+            return True
+        for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            if (nx, ny) in visited or not (0 <= nx < width and 0 <= ny < height):
+                continue
+            if heights[ny][nx] <= heights[y][x] + 1:
+                visited.add((nx, ny))
+                queue.append((nx, ny))
+    return False
+
+
+def make_day_12(rng: random.Random) -> str:
+    width, height = 80, 21
+    while True:
+        heights = [
+            [min(25, x * 26 // width + rng.choice([0, 0, 0, 2])) for x in range(width)]
+            for _ in range(height)
+        ]
+        heights[height // 2][0] = 0
+        heights[height // 2][width - 1] = 26
+        if is_end_reachable(heights):
+            break
+    rows = [[chr(97 + h) for h in row] for row in heights]
+    rows[height // 2][0] = "S"
+    rows[height // 2][width - 1] = "E"
+    return "".join("".join(row) + "\n" for row in rows)
+
+
+def make_packet(rng: random.Random, depth: int = 0) -> list | int:
+    if depth > 3 or rng.random() < 0.4:
+        return rng.randint(0, 10)
+    return [make_packet(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+
+
+def make_day_13(rng: random.Random) -> str:
+    pairs = []
+    for _ in range(300):
+        left, right = (
+            [make_packet(rng, 1) for _ in range(rng.randint(0, 5))] for _ in range(2)
+        )
+        pairs.append(f"{json.dumps(left)}\n{json.dumps(right)}\n".replace(" ", ""))
+    return "\n".join(pairs)
+
+
+def make_day_14(rng: random.Random) -> str:
+    lines = []
+    for _ in range(40):
+        x, y = rng.randint(460, 540), rng.randint(15, 75)
+        points = [(x, y)]
+        for i in range(rng.randint(1, 5)):
+            if i % 2:
+                y = min(80, y + rng.randint(1, 6))
+            else:
+                x += rng.randint(-10, 10) or 1
+            points.append((x, y))
+        lines.append(" -> ".join(f"{x},{y}" for x, y in points))
+    return "\n".join(lines) + "\n"
+
+
+def make_day_15(rng: random.Random, limit: int = 4000) -> str:
+    def distance(a: tuple[int, int], b: tuple[int, int]) -> int:
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+    gap = (
+        rng.randint(limit // 4, 3 * limit // 4),
+        rng.randint(limit // 4, 3 * limit // 4),
+    )
+    sensors = [
+        (gap[0] + dx, gap[1] + dy) for dx, dy in ((-7, 0), (9, 1), (1, -11), (-1, 6))
+    ]
+    sensors += [(x, y) for x in (0, limit) for y in (0, limit)]
+    sensors += [(rng.randint(0, limit), rng.randint(0, limit)) for _ in range(24)]
+    lines = []
+    for sensor in sensors:
+        # Each sensor reaches as far as possible without covering the gap
+        radius = distance(sensor, gap) - 1
+        beacon = (sensor[0] + radius // 2, sensor[1] - (radius - radius // 2))
+        lines.append(
+            f"Sensor at x={sensor[0]}, y={sensor[1]}: "
+            f"closest beacon is at x={beacon[0]}, y={beacon[1]}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+GENERATORS: dict[int, Callable[[random.Random], str]] = {
+    int(name[-2:]): generator
+    for name, generator in globals().items()
+    if name.startswith("make_day_")
+}
+GLOBALS = {15: {"LIMIT": 4000}}
+
+
+def make(output: Path, seed: int) -> None:
+    for day, generator in sorted(GENERATORS.items()):
+        folder = output / (str(day) if day > 9 else f"0{day}")
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / "input.txt").write_text(generator(random.Random(seed + day)))
+        if day in GLOBALS:
+            (folder / "globals.json").write_text(json.dumps(GLOBALS[day]) + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic puzzle inputs.")
+    parser.add_argument("--output", type=Path, default=Path("benchmarks/inputs"))
+    parser.add_argument("--seed", type=int, default=2022)
+    args = parser.parse_args()
+    make(args.output, args.seed)